@@ -1,10 +1,12 @@
 # additional_features/dashboard.py
 
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict
 
 from models.transactions import TransactionStatus
 from models.users import Role, LibraryUser
+from models.catalog import CatalogStore
+from models.columnar import ColumnarIndex
 from models.items import LibraryItem, ItemStatus
 from patterns.singleton.transaction_manager import TransactionManager
 from patterns.state.item_state import (
@@ -20,7 +22,7 @@ class Dashboard:
     def __init__(
         self,
         users_db: Dict[str, LibraryUser],
-        items_db: List[LibraryItem],
+        items_db: CatalogStore,
         tm: TransactionManager,
     ):
         self.users_db = users_db
@@ -52,7 +54,7 @@ class Dashboard:
 
     def check_availability(self):
         isbn = input("Enter ISBN to check: ").strip()
-        found = next((it for it in self.items_db if it.isbn == isbn), None)
+        found = self.items_db.get(isbn)
         if not found:
             print("📖 No such ISBN in catalog.")
             return
@@ -63,9 +65,7 @@ class Dashboard:
         print(f"\n🚨 Overdue Loans for {user.name}:")
         now = datetime.now()
         any_found = False
-        for tx in self.tm.transactions:
-            if tx.user_name != user.name:
-                continue
+        for tx in self.tm.get_open_transactions(user.name):
             if (
                 tx.status == TransactionStatus.OVERDUE
                 or (tx.status == TransactionStatus.ACTIVE and now > tx.due_date)
@@ -85,9 +85,27 @@ class Dashboard:
         print(f"  Loan duration : {user.get_borrow_duration()} days")
         print(f"  Currently loaned ISBNs: {user.current_loans or 'None'}")
         for isbn in user.current_loans:
-            title = next((it.title for it in self.items_db if it.isbn == isbn), "Unknown")
+            item = self.items_db.get(isbn)
+            title = item.title if item else "Unknown"
             print(f"    - {title} ({isbn})")
 
+    def catalog_statistics(self):
+        """Catalog breakdowns computed over the columnar index, not item objects."""
+        columns = self.items_db.index(ColumnarIndex)
+        print(f"\n📊 Catalog Statistics ({len(columns)} items)")
+        for column, title in (
+            ("status", "By status"),
+            ("item_type", "By type"),
+            ("language", "By language"),
+            ("decade", "By decade"),
+        ):
+            groups = columns.group_by(column)
+            print(f"  {title}:")
+            for value, count in groups[:10]:
+                print(f"    {value:<16} {count:>7}")
+        available = columns.count(status=ItemStatus.AVAILABLE)
+        print(f"  Available now: {available} of {len(columns)}")
+
     def manage_lending_policies(self):
         print("\n🔧 Manage Lending Policies")
         roles = list(BORROW_LIMITS.keys())
@@ -145,7 +163,7 @@ class Dashboard:
     def process_return(self):
         open_tx = [
             tx
-            for tx in self.tm.transactions
+            for tx in self.tm.get_open_transactions()
             if tx.status in {TransactionStatus.ACTIVE, TransactionStatus.OVERDUE}
         ]
         if not open_tx:
@@ -160,7 +178,7 @@ class Dashboard:
             return
         tx = open_tx[int(sel) - 1]
         usr = self.users_db.get(tx.user_name)
-        item = next((i for i in self.items_db if i.isbn == tx.isbn), None)
+        item = self.items_db.get(tx.isbn)
         ok, msg = self.tm.return_item(usr, item)
         print(("✔" if ok else "✘"), msg)
 
@@ -177,6 +195,7 @@ class Dashboard:
                 print(f"{idx}) Manage lending policies"); idx += 1
                 print(f"{idx}) Manage user roles");       idx += 1
                 print(f"{idx}) Process a return");        idx += 1
+                print(f"{idx}) Catalog statistics");      idx += 1
             print(f"{idx}) Exit")
             choice = input("Select: ").strip()
 
@@ -192,6 +211,8 @@ class Dashboard:
                 self.manage_user_roles()
             elif user.role == Role.LIBRARIAN and choice == "6":
                 self.process_return()
+            elif user.role == Role.LIBRARIAN and choice == "7":
+                self.catalog_statistics()
             elif choice == str(idx):
                 break
             else:
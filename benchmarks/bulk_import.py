@@ -0,0 +1,79 @@
+"""
+Bulk import throughput and working memory vs. feed size.
+
+    python -m benchmarks.bulk_import [rows]
+
+Writes synthetic CSV feeds (rows/10 and rows, 100,000 by default, with
+1% invalid rows) and imports each into a catalog with the search indexes
+built. Reports rows/s, and the importer's working memory: the tracemalloc
+peak above what the catalog keeps afterwards, which should stay flat as
+the feed grows.
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from models.catalog import CatalogStore
+from patterns.strategy.search_strategy import build_search_indexes
+from services.bulk_import import BASE_FIELDS, CatalogImporter, register_item_types
+
+GENRES = ["Fantasy", "Science Fiction", "Mystery", "History", "Biography", "Poetry",
+          "Programming", "AI", "Mathematics", "Physics"]
+TYPES = [("printedbook", "shelf_location", "S12"), ("ebook", "file_format", "EPUB"),
+         ("audiobook", "duration_minutes", "540"), ("researchpaper", "journal", "JMLR")]
+
+
+def write_feed(path, n, seed=5):
+    rng = random.Random(seed)
+    fields = ["type", *BASE_FIELDS] + [field for _, field, _ in TYPES]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for i in range(n):
+            kind, field, value = rng.choice(TYPES)
+            writer.writerow({
+                "type": kind,
+                "title": f"w{rng.randrange(5000)} w{rng.randrange(5000)} {i}",
+                "authors": f"Author{rng.randrange(n // 4 + 1)} Surname",
+                "isbn": f"ISBN{i:010d}",
+                "genres": ";".join(rng.sample(GENRES, 2)),
+                # 1% of rows miss their year and get rejected
+                "publication_year": "" if rng.random() < 0.01 else rng.randint(1900, 2024),
+                "language": "English",
+                field: value,
+            })
+
+
+def fresh_catalog():
+    catalog = CatalogStore()
+    build_search_indexes(catalog)
+    return catalog
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    register_item_types()
+    print(f"{'rows':>10} | {'rows/s':>10} | {'rejected':>8} | working memory")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (n // 10, n):
+            path = os.path.join(tmp, f"feed-{size}.csv")
+            write_feed(path, size)
+
+            start = time.perf_counter()
+            report = CatalogImporter(fresh_catalog()).import_file(path)
+            rate = report.rows / (time.perf_counter() - start)
+
+            catalog = fresh_catalog()
+            tracemalloc.start()
+            CatalogImporter(catalog).import_file(path)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{size:>10,} | {rate:>10,.0f} | {report.rejected:>8,} | {(peak - current) / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Full-catalog scans: iterating LibraryItem objects vs. the columnar index.
+
+    python -m benchmarks.columnar_scan [items]
+
+Builds a synthetic catalog (300,000 items by default) and times a
+filtered count, a filtered doc id scan and two group-bys both ways.
+"""
+import sys
+import time
+from collections import Counter
+
+from benchmarks.ranked_search import synthetic_catalog
+from models.columnar import ColumnarIndex, np
+from models.items import ItemStatus
+
+REPEATS = 3
+
+
+def best_ms(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    print(f"Building {n:,} synthetic items...")
+    catalog = synthetic_catalog(n)
+    items = list(catalog)
+    for item in items[::3]:
+        item.update_status(ItemStatus.CHECKED_OUT)
+    start = time.perf_counter()
+    columns = catalog.index(ColumnarIndex)
+    print(f"  columnar index: {time.perf_counter() - start:.1f}s ({'NumPy' if np else 'array/bytes'} backend)")
+
+    def wanted(item):
+        return item.status is ItemStatus.AVAILABLE and 1950 <= item.publication_year <= 1999
+
+    cases = [
+        ("count available 1950-99",
+         lambda: sum(1 for item in items if wanted(item)),
+         lambda: columns.count(status="Available", year=(1950, 1999))),
+        ("doc ids available 1950-99",
+         lambda: [catalog.doc_id(item.isbn) for item in items if wanted(item)],
+         lambda: columns.doc_ids(status="Available", year=(1950, 1999))),
+        ("group by status",
+         lambda: Counter(item.status for item in items),
+         lambda: columns.group_by("status")),
+        ("group by decade, available",
+         lambda: Counter(item.publication_year // 10 * 10 for item in items
+                         if item.status is ItemStatus.AVAILABLE),
+         lambda: columns.group_by("decade", status="Available")),
+    ]
+    print(f"\n{'scan':>28} | {'objects':>10} | {'columnar':>10} | speedup")
+    for name, objects, columnar in cases:
+        object_ms, expected = best_ms(objects)
+        column_ms, got = best_ms(columnar)
+        assert len(expected) == len(got) if not isinstance(expected, int) else expected == got
+        print(f"{name:>28} | {object_ms:>8.1f}ms | {column_ms:>8.1f}ms | {object_ms / column_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
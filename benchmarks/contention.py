@@ -0,0 +1,96 @@
+"""
+Borrow/return/reserve throughput under thread contention.
+
+    python -m benchmarks.contention [ops_per_thread] [items]
+
+Each thread drives its own users against a shared pool of items, mixing
+borrows, returns, reservations and cancellations. After every run the
+manager is checked for double checkouts and loans that disagree with
+item status.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+
+from models.items import PrintedBook, ItemStatus
+from models.users import LibraryUser, Role
+from patterns.singleton.transaction_manager import TransactionManager
+
+USERS_PER_THREAD = 4
+
+
+def worker(tm, users, items, ops, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(ops):
+        user = rng.choice(users)
+        item = rng.choice(items)
+        roll = rng.random()
+        if roll < 0.4:
+            tm.borrow_item(user, item)
+        elif roll < 0.8:
+            tm.return_item(user, item)
+        elif roll < 0.9:
+            tm.reserve_item(user, item)
+        else:
+            tm.cancel_reservation(user, item)
+
+
+def check(tm, items):
+    problems = []
+    for item in items:
+        holders = list(tm._active_by_isbn.get(item.isbn, {}))
+        if len(holders) > 1:
+            problems.append(f"{item.isbn} checked out to {holders}")
+        if holders and item.status != ItemStatus.CHECKED_OUT:
+            problems.append(f"{item.isbn} on loan but {item.status.name}")
+        if not holders and item.status == ItemStatus.CHECKED_OUT:
+            problems.append(f"{item.isbn} CHECKED_OUT without a loan")
+    return problems
+
+
+def run(tm, threads, ops, item_count):
+    tm.reset()
+    items = [
+        PrintedBook(f"Bench {i}", ["A. Author"], f"CONT{i:05d}", ["Bench"], 2000,
+                    "English", ItemStatus.AVAILABLE, "Z9")
+        for i in range(item_count)
+    ]
+    barrier = threading.Barrier(threads + 1)
+    pool = []
+    for t in range(threads):
+        users = [
+            LibraryUser(f"cont-{t}-{u}", f"c{t}{u}@x", "h", Role.RESEARCHER)
+            for u in range(USERS_PER_THREAD)
+        ]
+        pool.append(threading.Thread(target=worker, args=(tm, users, items, ops, t, barrier)))
+    # hold notifications are printed; keep them out of the report
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for thread in pool:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return threads * ops / elapsed, check(tm, items)
+
+
+def main():
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    item_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    tm = TransactionManager()
+
+    print(f"{'threads':>8} | {'ops/sec':>10} | invariants")
+    for threads in (1, 2, 4, 8, 16):
+        ops_per_sec, problems = run(tm, threads, ops, item_count)
+        status = "ok" if not problems else f"{len(problems)} violations, e.g. {problems[0]}"
+        print(f"{threads:>8} | {ops_per_sec:>10,.0f} | {status}")
+    tm.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Memory per catalog item: the old __dict__ layout vs. the slotted one.
+
+    python -m benchmarks.item_memory [items]
+
+Creates items (200,000 by default) from freshly split CSV-style rows, the
+way an import would, and reports the bytes each layout keeps alive per
+item (tracemalloc, after the row temporaries are freed). The "before"
+class reproduces the previous LibraryItem: per-instance __dict__, author
+and genre lists, an empty reservation_queue and its own state object.
+Both layouts register in an item registry and in a CatalogStore, as the
+app does, so that cost is in both columns (the old registry held strong
+references, the new one weak ones).
+"""
+import gc
+import random
+import sys
+import tracemalloc
+
+from models.catalog import CatalogStore
+from models.items import ItemStatus, PrintedBook
+
+GENRES = ["Fantasy", "Science Fiction", "Mystery", "History", "Biography", "Poetry",
+          "Programming", "AI", "Mathematics", "Physics"]
+LANGUAGES = ["English", "French", "German", "Spanish"]
+
+
+class _State:
+    pass
+
+
+# the old LibraryItem.__init__ registered every item in models.items.active_items
+_legacy_active_items = CatalogStore()
+
+
+class DictPrintedBook:
+    """PrintedBook as it was laid out before __slots__."""
+
+    def __init__(self, title, authors, isbn, genres, publication_year, language, status, shelf_location):
+        self.title = title
+        self.authors = authors
+        self.isbn = isbn
+        self.genres = genres
+        self.publication_year = publication_year
+        self.language = language
+        self.status = status
+        self.reservation_queue = []
+        self._state = _State()
+        self.shelf_location = shelf_location
+        _legacy_active_items.add(self)
+
+
+def rows(n, seed=11):
+    """Parsed rows with fresh (un-shared) strings, as csv/json parsing produces."""
+    rng = random.Random(seed)
+    for i in range(n):
+        line = "|".join([
+            f"Title {i}",
+            f"Author{rng.randrange(n // 4 + 1)} Surname;Author{rng.randrange(n // 4 + 1)} Other",
+            f"ISBN{i:010d}",
+            ";".join(rng.sample(GENRES, 2)),
+            str(rng.randint(1900, 2024)),
+            rng.choice(LANGUAGES),
+            f"S{rng.randrange(500)}",
+        ])
+        title, authors, isbn, genres, year, language, shelf = line.split("|")
+        yield title, authors.split(";"), isbn, genres.split(";"), int(year), language, shelf
+
+
+def retained_per_item(make, n):
+    catalog = CatalogStore()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for title, authors, isbn, genres, year, language, shelf in rows(n):
+        catalog.add(make(title, authors, isbn, genres, year, language, ItemStatus.AVAILABLE, shelf))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / n, catalog
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{n:,} printed books")
+    old, _ = retained_per_item(DictPrintedBook, n)
+    new, catalog = retained_per_item(PrintedBook, n)
+    sample = next(iter(catalog))
+    print(f"  __dict__ layout : {old:8.0f} bytes/item")
+    print(f"  __slots__ layout: {new:8.0f} bytes/item  ({1 - new / old:.0%} less)")
+    print(f"  has __dict__: {hasattr(sample, '__dict__')}, genres: {type(sample.genres).__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+BM25 ranked search on a large synthetic catalog.
+
+    python -m benchmarks.ranked_search [items]
+
+Builds a catalog of synthetic items (1,000,000 by default) with a
+Zipf-like title vocabulary, indexes it with BM25Index and times top-10
+queries of different selectivity: bounded-heap selection vs. sorting
+every match, with the old substring KeywordSearchStrategy scan for
+reference.
+"""
+import itertools
+import random
+import sys
+import time
+
+from models.catalog import CatalogStore
+from models.items import PrintedBook, ItemStatus
+from models.search_index import BM25Index
+from patterns.strategy.search_strategy import KeywordSearchStrategy, RankedSearchStrategy
+
+VOCABULARY = 5_000
+AUTHORS = 20_000
+GENRES = [
+    "Fantasy", "Science Fiction", "Mystery", "History", "Biography", "Poetry",
+    "Programming", "AI", "Mathematics", "Physics", "Economics", "Philosophy",
+    "Travel", "Cooking", "Art", "Music", "Drama", "Romance", "Horror", "Children",
+]
+REPEATS = 5
+
+
+def synthetic_catalog(n, seed=7):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(VOCABULARY)]
+    # Zipf-like: word i is drawn with weight 1/(i+1)
+    cum_weights = list(itertools.accumulate(1.0 / (i + 1) for i in range(VOCABULARY)))
+    authors = [f"Author{i} Surname{i % 997}" for i in range(AUTHORS)]
+    catalog = CatalogStore()
+    for i in range(n):
+        title = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(2, 6)))
+        catalog.add(PrintedBook(
+            title, [rng.choice(authors)], f"SYN{i:08d}", rng.sample(GENRES, 2),
+            rng.randint(1900, 2024), "English", ItemStatus.AVAILABLE, "S1",
+        ))
+    return catalog
+
+
+def timed(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Building {n:,} synthetic items...")
+    start = time.perf_counter()
+    catalog = synthetic_catalog(n)
+    print(f"  catalog : {time.perf_counter() - start:6.1f}s")
+    start = time.perf_counter()
+    index = catalog.index(BM25Index)
+    print(f"  BM25    : {time.perf_counter() - start:6.1f}s")
+
+    ranked = RankedSearchStrategy(k=10)
+    scan = KeywordSearchStrategy()
+    queries = ["w4000", "w4000 fantasy", "w250 w900", "w20 mystery", "w1 w2"]
+
+    print(f"\n{'query':>16} | {'matches':>9} | {'top-10 heap':>11} | {'full sort':>10} | {'substring scan':>14}")
+    for query in queries:
+        heap_ms, _ = timed(lambda: ranked.search_with_scores(catalog, query))
+        sort_ms, matches = timed(
+            lambda: sorted(index.scores(query).items(), key=lambda p: p[1], reverse=True)[:10]
+        )
+        scan_ms, _ = timed(lambda: scan.search(catalog, query.split()[0]), repeats=1)
+        count = len(index.scores(query))
+        print(f"{query:>16} | {count:>9,} | {heap_ms:>9.1f}ms | {sort_ms:>8.1f}ms | {scan_ms:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
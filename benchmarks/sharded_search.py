@@ -0,0 +1,74 @@
+"""
+Search latency vs. number of shard worker processes.
+
+    python -m benchmarks.sharded_search [items] [max_workers]
+
+Builds a synthetic catalog (200,000 items by default), then for the
+in-process SearchContext and for ShardedCatalog with 1, 2, 4 ...
+max_workers workers (default: CPU count, at least 4) times ranked top-10
+and filtered keyword queries. Scaling needs free cores: with fewer cores
+than workers the shards just take turns.
+"""
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.ranked_search import synthetic_catalog
+from patterns.strategy.search_strategy import (
+    IndexedKeywordSearchStrategy,
+    RankedSearchStrategy,
+    SearchContext,
+    build_search_indexes,
+)
+from services.sharded_search import ShardedCatalog
+
+REPEATS = 5
+QUERIES = [
+    ("ranked", RankedSearchStrategy(k=10), "w4000", {}),
+    ("ranked", RankedSearchStrategy(k=10), "w1 w2", {}),
+    ("keyword", IndexedKeywordSearchStrategy(), "w20 w30", {"genre": "Mystery"}),
+]
+
+
+def median_ms(context, catalog, strategy, query, filters):
+    context.set_strategy(strategy)
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        context.search(catalog, query, **filters)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def row(label, context, catalog):
+    cells = [f"{median_ms(context, catalog, *q[1:]):>16.1f}ms" for q in QUERIES]
+    print(f"{label:>12} | " + " | ".join(cells))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cpus = os.cpu_count() or 1
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(cpus, 4)
+    print(f"Building {n:,} synthetic items ({cpus} CPU{'s' if cpus > 1 else ''})...")
+    catalog = synthetic_catalog(n)
+    build_search_indexes(catalog)
+
+    header = " | ".join(f"{f'{kind} {query!r}':>18}" for kind, _, query, _ in QUERIES)
+    print(f"\n{'workers':>12} | {header}")
+    row("in-process", SearchContext(RankedSearchStrategy()), catalog)
+
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        with ShardedCatalog(catalog, workers) as shards:
+            # first query per shard builds its indexes; keep that out of the timings
+            for _, strategy, query, filters in QUERIES:
+                SearchContext(strategy, shards=shards).search(catalog, query, **filters)
+            setup = time.perf_counter() - start
+            row(f"{workers} ({setup:.0f}s)", SearchContext(RankedSearchStrategy(), shards=shards), catalog)
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start time of TransactionManager: full WAL replay vs. snapshot + tail.
+
+    python -m benchmarks.startup [historical_transactions]
+
+Writes a log of borrow/return pairs (plus a small tail of loans still open),
+then times rebuilding the manager from the whole log and from the latest
+snapshot followed by replay of only the records written after it.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from models.items import PrintedBook, ItemStatus
+from patterns.singleton.transaction_manager import TransactionManager
+from services.snapshot import SnapshotStore
+from services.wal import WriteAheadLog
+
+ITEMS = 10_000
+USERS = 1_000
+BATCH = 10_000
+
+
+def write_history(wal, transactions, open_loans):
+    start = datetime(2020, 1, 1)
+    written = 0
+    while written < transactions:
+        batch = []
+        for n in range(written, min(written + BATCH, transactions)):
+            user, isbn = f"user-{n % USERS}", f"BENCH{n % ITEMS:05d}"
+            at = (start + timedelta(seconds=n)).isoformat()
+            batch.append({"op": "borrow", "user": user, "isbn": isbn, "at": at, "days": 14})
+            if n < transactions - open_loans:
+                batch.append({"op": "return", "user": user, "isbn": isbn, "at": at})
+        wal.append_many(batch)
+        written += BATCH
+    wal.sync()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tail = max(1, transactions // 100)
+    items = [
+        PrintedBook(f"Bench {i}", ["A. Author"], f"BENCH{i:05d}", ["Bench"], 2000,
+                    "English", ItemStatus.AVAILABLE, "Z9")
+        for i in range(ITEMS)
+    ]
+    tm = TransactionManager()
+
+    with tempfile.TemporaryDirectory() as directory:
+        wal_path = os.path.join(directory, "transactions.wal")
+        wal = WriteAheadLog(wal_path, sync_every=10_000, sync_interval=None)
+        print(f"Writing {transactions:,} historical transactions...")
+        write_history(wal, transactions, open_loans=ITEMS // 2)
+        wal.close()
+        size = os.path.getsize(wal_path)
+
+        def full_replay():
+            tm.reset()
+            tm.recover(WriteAheadLog(wal_path, sync_interval=None))
+
+        replay_time = timed(full_replay)
+        open_loans = len(tm.get_open_transactions())
+
+        # snapshot the rebuilt state, then write a 1% tail behind it
+        store = SnapshotStore(os.path.join(directory, "snapshots"))
+        store.write(tm, items, [])
+        write_history(tm.wal, tail, open_loans=0)
+        tm.wal.close()
+
+        def snapshot_start():
+            tm.reset()
+            snapshot = store.load_latest()
+            tm.restore_snapshot(snapshot)
+            tm.recover(WriteAheadLog(wal_path, sync_interval=None), after_lsn=snapshot.lsn)
+
+        snapshot_time = timed(snapshot_start)
+        tm.wal.close()
+
+    print(f"WAL size            : {size / 2**20:,.1f} MB ({open_loans:,} open loans)")
+    print(f"Full replay         : {replay_time:8.2f} s")
+    print(f"Snapshot + {tail:,} tail : {snapshot_time:8.2f} s")
+    tm.attach_wal(None)
+    tm.reset()
+
+
+if __name__ == "__main__":
+    main()
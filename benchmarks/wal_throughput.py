@@ -0,0 +1,57 @@
+"""
+Sustained write throughput of the transaction write-ahead log.
+
+    python -m benchmarks.wal_throughput [records]
+
+Runs the same borrow/return workload through TransactionManager with the WAL
+attached at several group-commit batch sizes (records per fsync).
+"""
+import os
+import sys
+import tempfile
+import time
+
+from models.items import PrintedBook, ItemStatus
+from models.users import LibraryUser, Role
+from patterns.singleton.transaction_manager import TransactionManager
+from services.wal import WriteAheadLog
+
+
+def run(tm, users, items, records, sync_every, directory):
+    path = os.path.join(directory, f"bench-{sync_every}.wal")
+    wal = WriteAheadLog(path, sync_every=sync_every, sync_interval=None)
+    tm.reset()
+    tm.attach_wal(wal)
+    start = time.perf_counter()
+    ops = 0
+    while ops < records:
+        for user, item in zip(users, items):
+            tm.borrow_item(user, item)
+            tm.return_item(user, item)
+            ops += 2
+    wal.close()
+    tm.attach_wal(None)
+    elapsed = time.perf_counter() - start
+    return ops / elapsed, os.path.getsize(path)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    users = [LibraryUser(f"bench-{i}", f"b{i}@x", "h", Role.LIBRARIAN) for i in range(100)]
+    items = [
+        PrintedBook(f"Bench {i}", ["A. Author"], f"BENCH{i:05d}", ["Bench"], 2000,
+                    "English", ItemStatus.AVAILABLE, "Z9")
+        for i in range(100)
+    ]
+    tm = TransactionManager()
+
+    print(f"{'records/fsync':>14} | {'ops/sec':>10} | {'log size':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for sync_every in (1, 8, 64, 512):
+            ops_per_sec, size = run(tm, users, items, records, sync_every, directory)
+            print(f"{sync_every:>14} | {ops_per_sec:>10,.0f} | {size / 1024:>8,.0f}KB")
+    tm.reset()
+
+
+if __name__ == "__main__":
+    main()
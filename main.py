@@ -1,35 +1,76 @@
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from models.users import Role
+from models.registry import RegistryScope
+from models.catalog import CatalogStore
 from models.items import ItemStatus, PrintedBook, EBook, Audiobook, ResearchPaper
 from patterns.facade.library_facade import LibraryFacade
 from patterns.factory.user_factory import LibraryUserFactory
 from patterns.singleton.transaction_manager import TransactionManager
 from patterns.strategy.search_strategy import (
     SearchContext,
-    KeywordSearchStrategy,
-    AuthorSearchStrategy,
-    TypeSearchStrategy,
-    GenreSearchStrategy,
+    IndexedKeywordSearchStrategy,
+    build_search_indexes,
+    autocomplete,
+    IndexedAuthorSearchStrategy,
+    IndexedTypeSearchStrategy,
+    IndexedGenreSearchStrategy,
+    FilterSearchStrategy,
+    QuerySearchStrategy,
+    RankedSearchStrategy,
+    FuzzySearchStrategy,
 )
+from patterns.strategy.search_cache import SearchResultCache
 from additional_features.recommendation import (
     RecommendationEngine,
     HistoryBasedRecommendation,
     TrendingRecommendation,
 )
 from additional_features.dashboard import Dashboard
+from services.facets import FacetEngine, format_facets
+from services.scheduler import LibraryScheduler
+from services.bulk_import import CatalogImporter, register_item_types
+from services.snapshot import SnapshotStore
+from services.wal import WriteAheadLog
+from utils.config import (
+    WAL_PATH,
+    WAL_SYNC_EVERY,
+    WAL_SYNC_INTERVAL,
+    SNAPSHOT_DIR,
+    SNAPSHOT_INTERVAL_MINUTES,
+    SEARCH_PAGE_SIZE,
+)
 from utils.dummy_data import get_dummy_items
 
 class NexusLibraryApp:
     def __init__(self):
         self.users_db = {}      # email -> LibraryUser
-        self.items_db = []      # list of LibraryItem
+        self.items_db = CatalogStore()  # isbn -> LibraryItem
+        # lookups by ISBN / user name from the TM and scheduler resolve here
+        self.registry = RegistryScope("app", catalog=self.items_db).activate()
         self.tm = TransactionManager()
         self.facade = LibraryFacade()
         self.dashboard = Dashboard(self.users_db, self.items_db, self.tm)
+        self.search_context = SearchContext(IndexedKeywordSearchStrategy(), cache=SearchResultCache())
+        self.facets = FacetEngine(self.items_db)
         self._seed_users()
-        self._seed_items()
+        register_item_types()
+        self.snapshots = SnapshotStore(SNAPSHOT_DIR)
+        snapshot = self.snapshots.load_latest()
+        if snapshot:
+            self._restore_snapshot(snapshot)
+        else:
+            self._seed_items()
+        wal = WriteAheadLog(WAL_PATH, WAL_SYNC_EVERY, WAL_SYNC_INTERVAL)
+        self.tm.recover(wal, after_lsn=snapshot.lsn if snapshot else 0)
+        # after recovery, so autocomplete popularity sees the replayed loans
+        build_search_indexes(self.items_db)
+        self.scheduler = LibraryScheduler(self.tm)
+        self.scheduler.schedule_every(
+            timedelta(minutes=SNAPSHOT_INTERVAL_MINUTES), self._take_snapshot
+        )
+        self.scheduler.start()
 
     def _seed_users(self):
         LibraryUserFactory.register("student", Role.STUDENT)
@@ -41,6 +82,17 @@ class NexusLibraryApp:
     def _seed_items(self):
         self.items_db.extend(get_dummy_items())
 
+    def _restore_snapshot(self, snapshot):
+        self.items_db.extend(snapshot.items)
+        for user in snapshot.users:
+            # unpickled users never ran __init__, so register them here
+            self.registry.users.register(user)
+            self.users_db[user.email] = user
+        self.tm.restore_snapshot(snapshot)
+
+    def _take_snapshot(self):
+        self.snapshots.write(self.tm, self.items_db, self.users_db.values())
+
     def run(self):
         while True:
             choice = self._show_start_menu()
@@ -52,6 +104,8 @@ class NexusLibraryApp:
                     self._main_menu(user)
             elif choice == "3":
                 print("👋 Goodbye!")
+                self._take_snapshot()
+                self.tm.wal.close()
                 sys.exit(0)
             else:
                 print("Invalid choice.")
@@ -91,6 +145,7 @@ class NexusLibraryApp:
             print(f"❌ {e}")
             return
         user.notifications = []
+        self.tm.sync_user_loans(user)
         self.users_db[email] = user
         print(f"✅ Registered {name} as {role_enum.name}.")
 
@@ -120,24 +175,39 @@ class NexusLibraryApp:
 
     def _find_item(self, prompt: str = "Enter ISBN: "):
         isbn = input(prompt).strip()
-        item = next((it for it in self.items_db if it.isbn == isbn), None)
+        item = self.items_db.get(isbn)
         if not item:
             print("❌ ISBN not found.")
         return item
 
     def _search_books(self):
-        context = SearchContext(KeywordSearchStrategy())
+        context = self.search_context
         print("\nChoose search type:")
         print("  1) Keyword in title")
         print("  2) Author")
         print("  3) Item type")
         print("  4) Genre")
-        choice = input("Enter choice [1-4]: ").strip()
+        print("  5) Filters (e.g. Fantasy AND E-Book AND 1950..1980)")
+        print("  6) Query (e.g. author:tolkien genre:fantasy year:>1950 available)")
+        print("  7) Best matches (ranked)")
+        print("  8) Autocomplete a title or author")
+        choice = input("Enter choice [1-8]: ").strip()
+        if choice == "8":
+            prefix = input("Start typing: ")
+            suggestions = autocomplete(self.items_db, prefix)
+            if not suggestions:
+                print("No suggestions.")
+            for suggestion in suggestions:
+                print(f"  {suggestion}")
+            return
         strategies = {
-            "1": (KeywordSearchStrategy, "Enter keyword to search in titles: "),
-            "2": (AuthorSearchStrategy,  "Enter author name to search: " ),
-            "3": (TypeSearchStrategy,    "Enter item type (e.g. E-Book, Printed Book): " ),
-            "4": (GenreSearchStrategy,   "Enter genre to search: " ),
+            "1": (IndexedKeywordSearchStrategy, "Enter keyword to search in titles: "),
+            "2": (IndexedAuthorSearchStrategy, "Enter author name to search: " ),
+            "3": (IndexedTypeSearchStrategy, "Enter item type (e.g. E-Book, Printed Book): " ),
+            "4": (IndexedGenreSearchStrategy, "Enter genre to search: " ),
+            "5": (FilterSearchStrategy, "Enter filters joined by AND: " ),
+            "6": (QuerySearchStrategy, "Enter query: " ),
+            "7": (RankedSearchStrategy, "Enter search words: " ),
         }
         strat_class, prompt = strategies.get(choice, (None, None))
         if not strat_class:
@@ -145,39 +215,94 @@ class NexusLibraryApp:
             return
         context.set_strategy(strat_class())
         q = input(prompt).strip()
-        results = context.search(self.items_db, q)
-        if not results:
+        try:
+            page = context.paginate(self.items_db, q, SEARCH_PAGE_SIZE)
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            return
+        if not page.items and choice in ("1", "2"):
+            # likely a typo: offer the closest titles/authors instead of nothing
+            context.set_strategy(FuzzySearchStrategy())
+            page = context.paginate(self.items_db, q, SEARCH_PAGE_SIZE)
+            if page.items:
+                print("No exact matches. Did you mean:")
+        if not page.items:
             print("No matches.")
-        else:
-            print("Results:")
-            for it in results:
-                print(f"  {it.isbn} | {it.title} ({it.status.value})")
+            return
+        print("Results:")
+        self._page_through(
+            page,
+            lambda it: print(f"  {it.isbn} | {it.title} ({it.status.value})"),
+            # counted from index bitmaps when asked for, without listing every match
+            facets=lambda: self.facets.counts(context.result_bitmap(self.items_db, q)),
+        )
+
+    def _page_through(self, page, show, facets=None):
+        """Print results a page at a time: n/p to move, a number to jump, Enter to stop."""
+        while True:
+            for it in page:
+                show(it)
+            if not page.items:
+                print("  (no results on this page)")
+            if not page.has_more and page.prev_cursor is None:
+                if facets:
+                    print("Refine by:")
+                    print(format_facets(self.facets.counts(page.items), limit=3))
+                return
+            options = "[n]ext, [p]rev, page #" + (", [f]acets" if facets else "") + ", Enter to stop"
+            cmd = input(f"-- page {page.number + 1}{'' if page.has_more else ' (last)'} -- {options}: ")
+            cmd = cmd.strip().lower()
+            cursor = page.next_cursor or page.prev_cursor
+            try:
+                if cmd == "n" and page.has_more:
+                    page = self.search_context.fetch_page(page.next_cursor)
+                elif cmd == "p" and page.prev_cursor:
+                    page = self.search_context.fetch_page(page.prev_cursor)
+                elif cmd.isdigit() and int(cmd) >= 1:
+                    page = self.search_context.fetch_page(cursor, int(cmd) - 1)
+                elif cmd == "f" and facets:
+                    print(format_facets(facets(), limit=3))
+                    continue
+                elif not cmd:
+                    return
+                else:
+                    print("Invalid choice.")
+                    continue
+            except ValueError as exc:
+                print(f"❌ {exc}")
+                return
 
     def _view_book_details(self):
         if not self.items_db:
             print("No items in the catalog.")
             return
         print("\n📖 Full Catalog Details:")
-        for it in self.items_db:
-            print(f"\nISBN: {it.isbn}")
-            print(f" Title           : {it.title}")
-            print(f" Authors         : {', '.join(it.authors)}")
-            print(f" Genres          : {', '.join(it.genres)}")
-            print(f" Publication Year: {it.publication_year}")
-            print(f" Language        : {it.language}")
-            print(f" Status          : {it.status.value}")
-            if isinstance(it, PrintedBook):
-                print(f" Shelf Location  : {it.shelf_location}")
-            elif isinstance(it, EBook):
-                print(f" File Format     : {it.file_format}")
-            elif isinstance(it, Audiobook):
-                print(f" Duration (mins) : {it.duration_minutes}")
-            elif isinstance(it, ResearchPaper):
-                print(f" Journal         : {it.journal}")
-            print("-" * 50)
+        self._page_through(
+            self.search_context.cursors.open(self.items_db, SEARCH_PAGE_SIZE),
+            self._print_item_details,
+        )
+
+    @staticmethod
+    def _print_item_details(it):
+        print(f"\nISBN: {it.isbn}")
+        print(f" Title           : {it.title}")
+        print(f" Authors         : {', '.join(it.authors)}")
+        print(f" Genres          : {', '.join(it.genres)}")
+        print(f" Publication Year: {it.publication_year}")
+        print(f" Language        : {it.language}")
+        print(f" Status          : {it.status.value}")
+        if isinstance(it, PrintedBook):
+            print(f" Shelf Location  : {it.shelf_location}")
+        elif isinstance(it, EBook):
+            print(f" File Format     : {it.file_format}")
+        elif isinstance(it, Audiobook):
+            print(f" Duration (mins) : {it.duration_minutes}")
+        elif isinstance(it, ResearchPaper):
+            print(f" Journal         : {it.journal}")
+        print("-" * 50)
 
     def _show_history(self, user):
-        txs = [tx for tx in self.tm.transactions if tx.user_name == user.name]
+        txs = self.tm.get_user_history(user.name)
         if not txs:
             print("No borrowing history.")
             return
@@ -347,7 +472,7 @@ class NexusLibraryApp:
                     status=ItemStatus.AVAILABLE,
                     shelf_location="TBD",
                 )
-                self.items_db.append(new_book)
+                self.items_db.add(new_book)
                 print(f"Requested '{title}' for addition.")
             elif choice == "12": self.dashboard.check_availability()
             elif choice == "13": self.dashboard.list_overdue(user)
@@ -366,6 +491,23 @@ class NexusLibraryApp:
             elif choice == "2": self._view_book_details()
             else: print("Invalid choice.")
 
+    def _bulk_import(self):
+        path = input("CSV / JSONL file to import: ").strip()
+        try:
+            report = CatalogImporter(self.items_db).import_file(
+                path, on_chunk=lambda r: print(f"  ... {r.rows} rows ({r.rows_per_second:,.0f} rows/s)")
+            )
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ {report}")
+        for line, reason in report.rejections[:10]:
+            print(f"  line {line}: {reason}")
+        if report.rejected > 10:
+            print(f"  ... and {report.rejected - 10} more rejected rows")
+        # catalog changes are not in the WAL, so persist them now
+        self._take_snapshot()
+
     def _librarian_menu(self, user):
         all_users = list(self.users_db.values())
         while True:
@@ -385,6 +527,8 @@ class NexusLibraryApp:
             print("13) Manage Lending Policies")
             print("14) Manage User Roles")
             print("15) Process a Return")
+            print("16) Catalog Statistics")
+            print("17) Bulk Import Catalog")
             print("0) Logout")
             choice = input("Choice: ").strip()
             if choice == "0": break
@@ -412,6 +556,8 @@ class NexusLibraryApp:
             elif choice == "13": self.dashboard.manage_lending_policies()
             elif choice == "14": self.dashboard.manage_user_roles()
             elif choice == "15": self.dashboard.process_return()
+            elif choice == "16": self.dashboard.catalog_statistics()
+            elif choice == "17": self._bulk_import()
             else: print("Invalid choice.")
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+import threading
+import weakref
+from bisect import insort
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from models.search_index import CatalogIndex, tokenize
+from patterns.observer.notification_center import NotificationCenter
+from patterns.observer.observer import Observer
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem
+
+TOP_N = 5
+MAX_PREFIX = 40     # completions are keyed on at most this many characters
+
+
+class _Node:
+    """Radix tree node: `label` is the edge from the parent; `top` holds (-score, key), best first."""
+
+    __slots__ = ("label", "children", "keys", "top")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.children: Dict[str, "_Node"] = {}
+        self.keys: Optional[Set[str]] = None
+        self.top: List[Tuple[int, str]] = []
+
+
+class _Entry:
+    __slots__ = ("display", "score", "refs")
+
+    def __init__(self, display: str):
+        self.display = display
+        self.score = 0
+        self.refs = 0
+
+
+class AutocompleteIndex(CatalogIndex):
+    """
+    Type-ahead over titles and author names.
+
+    Phrases are stored in a radix tree (single-child chains collapsed into
+    one edge) under every word start, so "hob" completes "The Hobbit".
+    Every node keeps its subtree's TOP_N phrases ranked by popularity —
+    the number of times items carrying the phrase were borrowed — so a
+    lookup is a walk down the prefix plus reading one short list.
+
+    Popularity is seeded from TransactionManager.transactions and bumped
+    on every 'item_borrowed' notification.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._entries: Dict[str, _Entry] = {}
+        self._phrases: Dict[str, List[str]] = {}       # isbn -> phrase keys
+        self._lock = threading.Lock()
+        from patterns.singleton.transaction_manager import TransactionManager
+
+        self._borrows = Counter(tx.isbn for tx in TransactionManager().transactions)
+        NotificationCenter.get_subject().attach(_PopularityObserver(self))
+
+    # ─── Catalog hooks ────────────────────────────────────────────────────────
+    def add(self, doc_id: int, item: "LibraryItem"):
+        borrows = self._borrows.get(item.isbn, 0)
+        phrases = []
+        with self._lock:
+            for display in [item.title, *item.authors]:
+                key = " ".join(tokenize(display))
+                if not key or key in phrases:
+                    continue
+                phrases.append(key)
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = _Entry(display)
+                    for path in self._paths(key):
+                        self._insert(path, key)
+                entry.refs += 1
+                entry.score += borrows
+                self._offer(key)
+            self._phrases[item.isbn] = phrases
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        borrows = self._borrows.get(item.isbn, 0)
+        with self._lock:
+            for key in self._phrases.pop(item.isbn, ()):
+                entry = self._entries[key]
+                entry.refs -= 1
+                entry.score -= borrows
+                if not entry.refs:
+                    del self._entries[key]
+                for path in self._paths(key):
+                    self._rebuild_path(path, key, drop=not entry.refs)
+
+    def record_borrow(self, item: "LibraryItem"):
+        with self._lock:
+            self._borrows[item.isbn] += 1
+            for key in self._phrases.get(item.isbn, ()):
+                self._entries[key].score += 1
+                self._offer(key)
+
+    # ─── Lookup ───────────────────────────────────────────────────────────────
+    def complete(self, prefix: str, limit: int = TOP_N) -> List[str]:
+        """Most popular titles/authors with a word starting with `prefix`."""
+        p = " ".join(tokenize(prefix))[:MAX_PREFIX]
+        if prefix[-1:].isspace() and p:
+            p += " "
+        node = self._find(p)
+        if node is None:
+            return []
+        return [self._entries[key].display for _, key in node.top[:limit] if key in self._entries]
+
+    # ─── Radix tree internals ─────────────────────────────────────────────────
+    @staticmethod
+    def _paths(key: str) -> List[str]:
+        words = key.split(" ")
+        return [" ".join(words[i:])[:MAX_PREFIX] for i in range(len(words))]
+
+    def _find(self, prefix: str) -> Optional[_Node]:
+        node, i = self._root, 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i])
+            if child is None:
+                return None
+            rest = prefix[i:]
+            if rest.startswith(child.label):
+                i += len(child.label)
+                node = child
+            elif child.label.startswith(rest):
+                return child
+            else:
+                return None
+        return node
+
+    def _walk(self, path: str) -> List[_Node]:
+        """Nodes from the root to the node where `path` ends (it must exist)."""
+        node, i = self._root, 0
+        nodes = [node]
+        while i < len(path):
+            node = node.children[path[i]]
+            i += len(node.label)
+            nodes.append(node)
+        return nodes
+
+    def _insert(self, path: str, key: str):
+        node, i = self._root, 0
+        while i < len(path):
+            child = node.children.get(path[i])
+            if child is None:
+                child = node.children[path[i]] = _Node(path[i:])
+                node, i = child, len(path)
+                break
+            label = child.label
+            common = 0
+            limit = min(len(label), len(path) - i)
+            while common < limit and label[common] == path[i + common]:
+                common += 1
+            if common < len(label):
+                # split the edge; the new middle node covers the old child's subtree
+                middle = _Node(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                middle.top = list(child.top)
+                node.children[path[i]] = middle
+                child = middle
+            node, i = child, i + common
+        if node.keys is None:
+            node.keys = set()
+        node.keys.add(key)
+
+    def _offer(self, key: str):
+        """Re-rank `key` after its score went up, from its deepest nodes upward."""
+        score = self._entries[key].score
+        for path in self._paths(key):
+            for node in reversed(self._walk(path)):
+                top = node.top
+                for n, (_, k) in enumerate(top):
+                    if k == key:
+                        del top[n]
+                        break
+                insort(top, (-score, key))
+                if len(top) > TOP_N:
+                    dropped = top.pop()
+                    if dropped[1] == key:
+                        # not good enough here, so not good enough for any ancestor
+                        break
+
+    def _rebuild_path(self, path: str, key: str, drop: bool):
+        """Recompute the top lists along `path` after `key` lost score or was removed."""
+        nodes = self._walk(path)
+        if drop and nodes[-1].keys:
+            nodes[-1].keys.discard(key)
+        for node in reversed(nodes):
+            candidates = {}
+            keys = [k for child in node.children.values() for _, k in child.top]
+            keys.extend(node.keys or ())
+            for k in keys:
+                # a dropped key may still sit on its other paths until those are rebuilt
+                entry = self._entries.get(k)
+                if entry is not None:
+                    candidates[k] = entry.score
+            node.top = sorted((-score, k) for k, score in candidates.items())[:TOP_N]
+
+
+class _PopularityObserver(Observer):
+    """Forwards borrow notifications to an AutocompleteIndex without keeping it alive."""
+
+    def __init__(self, index: AutocompleteIndex):
+        self._index = weakref.ref(index)
+
+    def update(self, event_type, user=None, item=None, due_date=None):
+        index = self._index()
+        if index is None:
+            NotificationCenter.get_subject().detach(self)
+        elif event_type == "item_borrowed" and item is not None:
+            index.record_borrow(item)
@@ -0,0 +1,224 @@
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from models.range_index import YearRangeIndex
+from models.search_index import CatalogIndex, normalize
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem, ItemStatus
+
+CHUNK_BITS = 12                     # 4096 doc ids per container
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+class Bitmap:
+    """
+    Set of doc ids stored as fixed-size int bitsets keyed by chunk number
+    (roaring-style containers). Setting or clearing one bit only copies a
+    512-byte container, and AND/OR work container by container, skipping
+    chunks missing from either side.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, int]] = None):
+        self._chunks: Dict[int, int] = chunks or {}
+
+    @classmethod
+    def from_ids(cls, doc_ids: Iterable[int]) -> "Bitmap":
+        chunks: Dict[int, int] = {}
+        for doc_id in doc_ids:
+            key = doc_id >> CHUNK_BITS
+            chunks[key] = chunks.get(key, 0) | (1 << (doc_id & CHUNK_MASK))
+        return cls(chunks)
+
+    def add(self, doc_id: int):
+        key = doc_id >> CHUNK_BITS
+        self._chunks[key] = self._chunks.get(key, 0) | (1 << (doc_id & CHUNK_MASK))
+
+    def discard(self, doc_id: int):
+        key = doc_id >> CHUNK_BITS
+        bits = self._chunks.get(key, 0) & ~(1 << (doc_id & CHUNK_MASK))
+        if bits:
+            self._chunks[key] = bits
+        else:
+            self._chunks.pop(key, None)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return bool(self._chunks.get(doc_id >> CHUNK_BITS, 0) >> (doc_id & CHUNK_MASK) & 1)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        chunks = {}
+        for key, bits in small.items():
+            both = bits & large.get(key, 0)
+            if both:
+                chunks[key] = both
+        return Bitmap(chunks)
+
+    def intersection_count(self, other: "Bitmap") -> int:
+        """len(self & other) without building the intersection."""
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        return sum((bits & large.get(key, 0)).bit_count() for key, bits in small.items())
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self._chunks)
+        for key, bits in other._chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return Bitmap(chunks)
+
+    def __len__(self) -> int:
+        return sum(bits.bit_count() for bits in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Doc ids in ascending order, as of the call: containers are immutable
+        ints, so iterating a snapshot of them is unaffected by later adds
+        and discards (paginated result streams rely on this).
+        """
+        for key, bits in sorted(self._chunks.items()):
+            base = key << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base + low.bit_length() - 1
+                bits ^= low
+
+    def copy(self) -> "Bitmap":
+        return Bitmap(dict(self._chunks))
+
+    def __repr__(self) -> str:
+        return f"Bitmap({len(self)} ids)"
+
+
+class BitmapIndex(CatalogIndex):
+    """Index from a small set of keys (genre, type, ...) to a Bitmap of doc ids."""
+
+    def __init__(self):
+        self._bitmaps: Dict[Hashable, Bitmap] = {}
+
+    def keys_of(self, item: "LibraryItem") -> Iterable[Hashable]:
+        raise NotImplementedError
+
+    def key(self, value) -> Hashable:
+        """Normalize a user-supplied value to an index key."""
+        return normalize(str(value))
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for key in set(self.keys_of(item)):
+            bitmap = self._bitmaps.get(key)
+            if bitmap is None:
+                bitmap = self._bitmaps[key] = Bitmap()
+            bitmap.add(doc_id)
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        for key in set(self.keys_of(item)):
+            self._discard(key, doc_id)
+
+    def _discard(self, key: Hashable, doc_id: int):
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            return
+        bitmap.discard(doc_id)
+        if not bitmap:
+            del self._bitmaps[key]
+
+    def bitmap(self, value) -> Bitmap:
+        return self._bitmaps.get(self.key(value), Bitmap())
+
+    def cardinality(self, value) -> int:
+        return len(self.bitmap(value))
+
+    def keys(self) -> List[Hashable]:
+        return list(self._bitmaps)
+
+    def __contains__(self, value) -> bool:
+        return self.key(value) in self._bitmaps
+
+
+class GenreBitmapIndex(BitmapIndex):
+    def keys_of(self, item: "LibraryItem") -> Iterable[str]:
+        return [normalize(genre) for genre in getattr(item, "genres", ())]
+
+
+class TypeBitmapIndex(BitmapIndex):
+    def keys_of(self, item: "LibraryItem") -> Iterable[str]:
+        return [normalize(item.item_type())]
+
+
+class LanguageBitmapIndex(BitmapIndex):
+    def keys_of(self, item: "LibraryItem") -> Iterable[str]:
+        return [normalize(item.language)]
+
+
+class DecadeBitmapIndex(BitmapIndex):
+    """Keyed by the decade's first year; accepts 1950, 1954 or "1950s"."""
+
+    def keys_of(self, item: "LibraryItem") -> Iterable[int]:
+        return [item.publication_year // 10 * 10]
+
+    def key(self, value) -> Optional[int]:
+        if isinstance(value, int):
+            return value // 10 * 10
+        text = str(value).strip().lower()
+        # "1950s" only: a bare year string is a year filter, not a decade
+        if text.endswith("s") and text[:-1].lstrip("-").isdigit():
+            return int(text[:-1]) // 10 * 10
+        return None
+
+
+class StatusBitmapIndex(BitmapIndex):
+    """Keyed by ItemStatus; kept current through LibraryItem.update_status()."""
+
+    def keys_of(self, item: "LibraryItem") -> Iterable["ItemStatus"]:
+        return [item.status]
+
+    def key(self, value):
+        from models.items import ItemStatus
+
+        if isinstance(value, ItemStatus):
+            return value
+        wanted = normalize(str(value)).replace("_", " ")
+        for status in ItemStatus:
+            if wanted in (normalize(status.value), normalize(status.name).replace("_", " ")):
+                return status
+        return None
+
+    def status_changed(self, doc_id: int, item: "LibraryItem", old_status: "ItemStatus"):
+        self._discard(old_status, doc_id)
+        self.add(doc_id, item)
+
+
+FILTER_INDEXES = {
+    "genre": GenreBitmapIndex,
+    "item_type": TypeBitmapIndex,
+    "language": LanguageBitmapIndex,
+    "status": StatusBitmapIndex,
+    "decade": DecadeBitmapIndex,
+    "year": YearRangeIndex,
+}
+
+
+def filter_bitmap(catalog, **criteria) -> Optional[Bitmap]:
+    """
+    AND together the bitmaps for the given filters, e.g.
+    filter_bitmap(catalog, genre="Fantasy", item_type="E-Book", status="Available").
+    `year` takes anything year_bounds() reads: 1954, (1950, 1980), ">1950".
+    Smallest bitmap first, stopping as soon as the result is empty.
+    Returns None when no criteria are given (no restriction).
+    """
+    bitmaps = []
+    for field, value in criteria.items():
+        if value is None:
+            continue
+        bitmaps.append(catalog.index(FILTER_INDEXES[field]).bitmap(value))
+    if not bitmaps:
+        return None
+    bitmaps.sort(key=len)
+    result = bitmaps[0]
+    for bitmap in bitmaps[1:]:
+        if not result:
+            break
+        result = result & bitmap
+    return result
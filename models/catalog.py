@@ -0,0 +1,166 @@
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem
+
+# every live catalog; told about each LibraryItem.update_status()
+_status_listeners = weakref.WeakSet()
+
+
+def notify_status_changed(item: "LibraryItem", old_status):
+    for catalog in list(_status_listeners):
+        catalog.item_status_changed(item, old_status)
+
+
+class CatalogStore:
+    """
+    ISBN-keyed store for library items.
+
+    Keeps catalog order for iteration while answering ISBN lookups in O(1).
+    Adding an item whose ISBN is already present replaces the old entry in place.
+
+    Every ISBN also gets a small dense doc id (stable across replacement)
+    that search indexes use in their posting lists. Indexes are built on
+    first request via index() and kept up to date on every add/remove.
+
+    `generation` goes up on every add, remove and status change of a
+    cataloged item, so caches can tell their results are stale. It is
+    bumped only after the indexes have changed: a reader that sees the new
+    generation never searches the old index.
+    """
+
+    def __init__(self, items: Iterable["LibraryItem"] = ()):
+        self._by_isbn: Dict[str, "LibraryItem"] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._docs: List[Optional["LibraryItem"]] = []
+        self._indexes: Dict[type, object] = {}
+        # index updates are read-modify-write; status changes can come from
+        # any borrowing thread or the scheduler, so mutations are serialized
+        self._lock = threading.RLock()
+        self.generation = 0
+        _status_listeners.add(self)
+        self.extend(items)
+
+    def add(self, item: "LibraryItem"):
+        with self._lock:
+            self._add(item)
+
+    def _add(self, item: "LibraryItem"):
+        doc_id = self._doc_ids.get(item.isbn)
+        if doc_id is None:
+            doc_id = self._doc_ids[item.isbn] = len(self._docs)
+            self._docs.append(None)
+        old = self._docs[doc_id]
+        if old is item:
+            return
+        for index in self._indexes.values():
+            if old is not None:
+                index.remove(doc_id, old)
+            index.add(doc_id, item)
+        self._docs[doc_id] = item
+        self._by_isbn[item.isbn] = item
+        self.generation += 1
+
+    # list-style alias so existing `catalog.append(item)` callers keep working
+    append = add
+
+    def extend(self, items: Iterable["LibraryItem"]):
+        with self._lock:
+            for item in items:
+                self._add(item)
+
+    def update(self, item: "LibraryItem", **fields):
+        """
+        Change fields of a cataloged item in place and re-index it. The item
+        object and its doc id stay the same, so code holding a reference
+        (loans, holds, scheduled timers) keeps acting on the cataloged item.
+        """
+        with self._lock:
+            doc_id = self._doc_ids.get(item.isbn)
+            if doc_id is None or self._docs[doc_id] is not item:
+                raise ValueError(f"Item '{item.isbn}' is not in this catalog.")
+            for index in self._indexes.values():
+                index.remove(doc_id, item)
+            for name, value in fields.items():
+                setattr(item, name, value)
+            for index in self._indexes.values():
+                index.add(doc_id, item)
+            self.generation += 1
+
+    def remove(self, isbn: str) -> Optional["LibraryItem"]:
+        with self._lock:
+            item = self._by_isbn.pop(isbn, None)
+            if item is not None:
+                doc_id = self._doc_ids.pop(isbn)
+                self._docs[doc_id] = None
+                for index in self._indexes.values():
+                    index.remove(doc_id, item)
+                self.generation += 1
+            return item
+
+    def get(self, isbn: str, default: Optional["LibraryItem"] = None) -> Optional["LibraryItem"]:
+        return self._by_isbn.get(isbn, default)
+
+    def isbns(self):
+        return self._by_isbn.keys()
+
+    # ─── Doc ids & indexes ────────────────────────────────────────────────────
+    def doc(self, doc_id: int) -> Optional["LibraryItem"]:
+        return self._docs[doc_id]
+
+    def doc_id(self, isbn: str) -> Optional[int]:
+        return self._doc_ids.get(isbn)
+
+    def docs(self) -> Iterator[Tuple[int, "LibraryItem"]]:
+        """(doc_id, item) pairs in doc id order, skipping removed slots."""
+        for doc_id, item in enumerate(self._docs):
+            if item is not None:
+                yield doc_id, item
+
+    def index(self, index_cls: Type):
+        """The catalog's instance of `index_cls`, built from the current items on first use."""
+        index = self._indexes.get(index_cls)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(index_cls)
+                if index is None:
+                    index = index_cls()
+                    for doc_id, item in self.docs():
+                        index.add(doc_id, item)
+                    self._indexes[index_cls] = index
+        return index
+
+    def attach(self, index):
+        """Register an index instance (one needing constructor arguments) and feed it the current items."""
+        with self._lock:
+            for doc_id, item in self.docs():
+                index.add(doc_id, item)
+            self._indexes[index] = index
+
+    def detach(self, index):
+        with self._lock:
+            self._indexes.pop(index, None)
+
+    def item_status_changed(self, item: "LibraryItem", old_status):
+        doc_id = self._doc_ids.get(item.isbn)
+        if doc_id is None or self._docs[doc_id] is not item:
+            return
+        with self._lock:
+            for index in self._indexes.values():
+                index.status_changed(doc_id, item, old_status)
+            self.generation += 1
+
+    def __contains__(self, isbn: str) -> bool:
+        return isbn in self._by_isbn
+
+    def __iter__(self) -> Iterator["LibraryItem"]:
+        # same order as the ISBN dict, but safe to resume after the catalog changed
+        return (item for _, item in self.docs())
+
+    def __len__(self) -> int:
+        return len(self._by_isbn)
+
+    def __repr__(self) -> str:
+        return f"CatalogStore({len(self)} items)"
@@ -0,0 +1,214 @@
+import threading
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from models.bitmap_index import StatusBitmapIndex
+from models.range_index import year_bounds
+from models.search_index import CatalogIndex, normalize
+
+try:
+    import numpy as np
+except ImportError:     # optional: the array/bytes fallback gives the same answers
+    np = None
+
+if np is not None:
+    _DTYPES = {"B": np.uint8, "H": np.uint16, "i": np.int32}
+
+CODE_COLUMNS = ("item_type", "status", "language")
+GROUP_COLUMNS = CODE_COLUMNS + ("year", "decade")
+
+
+class Dictionary:
+    """
+    Dictionary encoding for one string column: each distinct value (after
+    `key`) gets a small int code; code 0 is reserved for "no value".
+    """
+
+    def __init__(self, key: Callable[[object], Hashable] = normalize):
+        self._key = key
+        self._codes: Dict[Hashable, int] = {}
+        self.labels: List[str] = [""]
+
+    def encode(self, value) -> int:
+        key = self._key(value)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.labels)
+            self.labels.append(getattr(value, "value", value))
+        return code
+
+    def lookup(self, value) -> Optional[int]:
+        key = self._key(value)
+        return None if key is None else self._codes.get(key)
+
+    def __len__(self) -> int:
+        return len(self.labels) - 1
+
+
+class ColumnarIndex(CatalogIndex):
+    """
+    Column-per-attribute copy of the catalog for full scans.
+
+    Row n describes doc id n: publication year in an int32 array, and item
+    type, status and language as dictionary codes in byte arrays (widened
+    to 16 bits if a column ever has more than 255 distinct values). A
+    `live` byte column masks out removed docs. The catalog keeps it in
+    sync through the usual add/remove/status_changed hooks.
+
+    Filters build a row mask and counts, doc id lists and group-bys work
+    on the whole column at once. With NumPy installed every step is a
+    vector operation. Without it, filters on 8-bit code columns use
+    bytes.translate, masks are combined with big-int AND and scans use
+    itertools.compress/Counter, all of which run in C; a year filter, or
+    a filter on a code column widened to 16 bits, falls back to a
+    Python-level comparison per row and costs about as much as iterating
+    the items.
+    """
+
+    def __init__(self):
+        self.dictionaries = {
+            "item_type": Dictionary(),
+            "status": Dictionary(StatusBitmapIndex().key),
+            "language": Dictionary(),
+        }
+        self._codes = {name: array("B") for name in CODE_COLUMNS}
+        self._year = array("i")
+        self._live = array("B")
+        self._lock = threading.Lock()
+
+    # ─── Catalog hooks ────────────────────────────────────────────────────────
+    def add(self, doc_id: int, item):
+        with self._lock:
+            missing = doc_id + 1 - len(self._live)
+            if missing > 0:
+                for column in (*self._codes.values(), self._year, self._live):
+                    column.frombytes(bytes(missing * column.itemsize))
+            self._year[doc_id] = item.publication_year
+            self._set_code("item_type", doc_id, item.item_type())
+            self._set_code("status", doc_id, item.status)
+            self._set_code("language", doc_id, item.language)
+            self._live[doc_id] = 1
+
+    def remove(self, doc_id: int, item):
+        with self._lock:
+            self._live[doc_id] = 0
+
+    def status_changed(self, doc_id: int, item, old_status):
+        with self._lock:
+            self._set_code("status", doc_id, item.status)
+
+    def _set_code(self, name: str, doc_id: int, value):
+        code = self.dictionaries[name].encode(value)
+        column = self._codes[name]
+        if code > 255 and column.typecode == "B":
+            column = self._codes[name] = array("H", column)
+        column[doc_id] = code
+
+    # ─── Masks ────────────────────────────────────────────────────────────────
+    def _wanted(self, name: str, value) -> Set[int]:
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        codes = (self.dictionaries[name].lookup(v) for v in values)
+        return {code for code in codes if code is not None}
+
+    def _mask(self, criteria: dict):
+        """Rows matching every criterion: a NumPy bool array, or bytes of 0/1 (caller holds the lock)."""
+        for name in criteria:
+            if name not in CODE_COLUMNS and name != "year":
+                raise ValueError(f"Unknown column '{name}'.")
+        if np is not None:
+            mask = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+            for name, value in criteria.items():
+                if name == "year":
+                    lo, hi = year_bounds(value)
+                    years = np.frombuffer(self._year, dtype=np.int32)
+                    if lo is not None:
+                        mask &= years >= lo
+                    if hi is not None:
+                        mask &= years <= hi
+                else:
+                    column = self._codes[name]
+                    codes = np.frombuffer(column, dtype=_DTYPES[column.typecode])
+                    mask &= np.isin(codes, list(self._wanted(name, value)))
+            return mask
+
+        mask = self._live.tobytes()
+        for name, value in criteria.items():
+            if name == "year":
+                # per-row Python comparison: the slow part of the fallback
+                lo, hi = year_bounds(value)
+                lo = float("-inf") if lo is None else lo
+                hi = float("inf") if hi is None else hi
+                rows = bytes(lo <= year <= hi for year in self._year)
+            else:
+                wanted = self._wanted(name, value)
+                column = self._codes[name]
+                if column.typecode == "B":
+                    table = bytearray(256)
+                    for code in wanted:
+                        table[code] = 1
+                    rows = column.tobytes().translate(table)
+                else:
+                    rows = bytes(code in wanted for code in column)
+            both = int.from_bytes(mask, "little") & int.from_bytes(rows, "little")
+            mask = both.to_bytes(len(mask), "little")
+        return mask
+
+    # ─── Scans ────────────────────────────────────────────────────────────────
+    def count(self, **criteria) -> int:
+        """Number of items matching the criteria, e.g. count(status="Available", year=(1950, 1999))."""
+        with self._lock:
+            mask = self._mask(criteria)
+            return int(mask.sum()) if np is not None else mask.count(1)
+
+    def doc_ids(self, **criteria) -> List[int]:
+        """Doc ids of the matching items, ascending."""
+        with self._lock:
+            mask = self._mask(criteria)
+            if np is not None:
+                return np.flatnonzero(mask).tolist()
+            return list(compress(range(len(mask)), mask))
+
+    def group_by(self, column: str, **criteria) -> List[Tuple[object, int]]:
+        """
+        (value, count) for `column` (item_type, status, language, year or
+        decade) over the matching items, most common first.
+        """
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by '{column}'.")
+        with self._lock:
+            mask = self._mask(criteria)
+            if column in CODE_COLUMNS:
+                labels = self.dictionaries[column].labels
+                codes = self._codes[column]
+                if np is not None:
+                    counts = np.bincount(
+                        np.frombuffer(codes, dtype=_DTYPES[codes.typecode])[mask], minlength=len(labels)
+                    )
+                    pairs = [(labels[code], int(n)) for code, n in enumerate(counts.tolist()) if n]
+                else:
+                    pairs = [(labels[code], n) for code, n in Counter(compress(codes, mask)).items()]
+            else:
+                if np is not None:
+                    years = np.frombuffer(self._year, dtype=np.int32)[mask]
+                    if column == "decade":
+                        years = years // 10 * 10
+                    values, counts = np.unique(years, return_counts=True)
+                    grouped = zip(values.tolist(), counts.tolist())
+                else:
+                    years = Counter(compress(self._year, mask))
+                    if column == "decade":
+                        decades = Counter()
+                        for year, n in years.items():
+                            decades[year // 10 * 10] += n
+                        years = decades
+                    grouped = years.items()
+                label = "{}s".format if column == "decade" else int
+                pairs = [(label(value), n) for value, n in grouped]
+        pairs.sort(key=lambda pair: (-pair[1], str(pair[0])))
+        return pairs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._live.count(1)
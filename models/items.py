@@ -1,8 +1,22 @@
+import sys
 from enum import Enum
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 from abc import ABC, abstractmethod
+from models.catalog import notify_status_changed
+from models.registry import current_scope
+
+# every distinct genre combination is stored once and shared by its items
+_genre_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _interned(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
+
+
+def _shared_genres(genres: Iterable[str]) -> Tuple[str, ...]:
+    key = _interned(genres)
+    return _genre_tuples.setdefault(key, key)
 
-active_items: List["LibraryItem"] = []
 
 class ItemStatus(Enum):
     AVAILABLE = "Available"
@@ -11,6 +25,24 @@ class ItemStatus(Enum):
     UNDER_REVIEW = "Under Review"
 
 class LibraryItem(ABC):
+    """
+    Base catalog item. Items use __slots__ (no per-instance __dict__),
+    keep authors and genres as tuples of interned strings, and share
+    their state objects, so millions of them stay compact.
+    """
+
+    __slots__ = (
+        "title",
+        "authors",
+        "isbn",
+        "genres",
+        "publication_year",
+        "language",
+        "status",
+        "_state",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         title: str,
@@ -22,25 +54,38 @@ class LibraryItem(ABC):
         status: ItemStatus = ItemStatus.AVAILABLE
     ):
         self.title = title
-        self.authors = authors
+        self.authors = _interned(authors)
         self.isbn = isbn
-        self.genres = genres
+        self.genres = _shared_genres(genres)
         self.publication_year = publication_year
-        self.language = language
+        self.language = sys.intern(language)
         self.status = status
-        self.reservation_queue = []
-        
+
         from patterns.state.item_state import AvailableState
         self._state = AvailableState()
 
-        active_items.append(self)
+        current_scope().items.register(self)
+
+    def __setstate__(self, state):
+        # pickles written before items had __slots__ carry a plain __dict__
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        state.pop("reservation_queue", None)
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.authors = _interned(self.authors)
+        self.genres = _shared_genres(self.genres)
+        self.language = sys.intern(self.language)
 
     @abstractmethod
     def item_type(self) -> str:
         pass
 
     def update_status(self, new_status: ItemStatus):
+        old_status = self.status
         self.status = new_status
+        if old_status is not new_status:
+            notify_status_changed(self, old_status)
 
     def borrow(self, user):
         return self._state.borrow(self, user)
@@ -64,6 +109,8 @@ class LibraryItem(ABC):
         )
 
 class EBook(LibraryItem):
+    __slots__ = ("file_format",)
+
     def __init__(
         self,
         title: str,
@@ -85,6 +132,8 @@ class EBook(LibraryItem):
         return f"{super().__str__()}, Format: {self.file_format}"
 
 class PrintedBook(LibraryItem):
+    __slots__ = ("shelf_location",)
+
     def __init__(
         self,
         title: str,
@@ -106,6 +155,8 @@ class PrintedBook(LibraryItem):
         return f"{super().__str__()}, Shelf: {self.shelf_location}"
 
 class Audiobook(LibraryItem):
+    __slots__ = ("duration_minutes",)
+
     def __init__(
         self,
         title: str,
@@ -127,6 +178,8 @@ class Audiobook(LibraryItem):
         return f"{super().__str__()}, Duration: {self.duration_minutes} mins"
 
 class ResearchPaper(LibraryItem):
+    __slots__ = ("journal",)
+
     def __init__(
         self,
         title: str,
@@ -0,0 +1,154 @@
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from models.search_index import CatalogIndex
+
+try:
+    import numpy as np
+except ImportError:     # optional: bisect over the array works the same, only slower for big ranges
+    np = None
+
+if TYPE_CHECKING:
+    from models.bitmap_index import Bitmap
+    from models.items import LibraryItem
+
+DOC_BITS = 32
+DOC_MASK = (1 << DOC_BITS) - 1
+# pending adds merged one by one below this; above it the array is re-sorted in one go
+MERGE_THRESHOLD = 64
+
+YearRange = Tuple[Optional[int], Optional[int]]
+
+
+def year_bounds(value) -> YearRange:
+    """
+    Turn a year filter into inclusive (lo, hi) bounds, None meaning open:
+    1954, (1950, 1980), "1954", "1950..1980", "..1980", ">1950", ">=1950",
+    "<1980", "<=1980". Raises ValueError for anything else.
+    """
+    if isinstance(value, int):
+        return value, value
+    if isinstance(value, (tuple, list)):
+        lo, hi = value
+        return (int(lo) if lo is not None else None, int(hi) if hi is not None else None)
+    text = str(value).replace(" ", "")
+    try:
+        if ".." in text:
+            lo, hi = text.split("..", 1)
+            return int(lo) if lo else None, int(hi) if hi else None
+        for op in (">=", "<=", ">", "<", "="):
+            if text.startswith(op):
+                year = int(text[len(op):])
+                return {
+                    ">=": (year, None),
+                    "<=": (None, year),
+                    ">": (year + 1, None),
+                    "<": (None, year - 1),
+                    "=": (year, year),
+                }[op]
+        return int(text), int(text)
+    except ValueError:
+        raise ValueError(f"Invalid year filter '{value}'.")
+
+
+class YearRangeIndex(CatalogIndex):
+    """
+    Sorted array over publication_year answering [lo, hi] ranges in
+    O(log n + k).
+
+    Each entry packs (year, doc_id) into one 64-bit key, year in the high
+    bits, so a range is two binary searches and a slice; the doc ids come
+    back ordered by year. Both searches are plain bisect calls on the
+    packed array; with NumPy installed, only the unpacking of doc ids from
+    a large slice runs vectorized.
+
+    Adds are buffered and merged in before the next lookup, so loading a
+    whole catalog costs one sort instead of n array inserts.
+    """
+
+    def __init__(self):
+        self._keys = array("q")
+        self._pending: List[int] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(doc_id: int, item: "LibraryItem") -> int:
+        return (item.publication_year << DOC_BITS) | doc_id
+
+    # ─── Catalog hooks ────────────────────────────────────────────────────────
+    def add(self, doc_id: int, item: "LibraryItem"):
+        with self._lock:
+            self._pending.append(self._key(doc_id, item))
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        key = self._key(doc_id, item)
+        with self._lock:
+            self._merge()
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def _merge(self):
+        pending = self._pending
+        if not pending:
+            return
+        if len(pending) < MERGE_THRESHOLD:
+            for key in pending:
+                insort(self._keys, key)
+        else:
+            pending.extend(self._keys)
+            pending.sort()
+            self._keys = array("q", pending)
+        self._pending = []
+
+    # ─── Lookup ───────────────────────────────────────────────────────────────
+    def _span(self, lo: Optional[int], hi: Optional[int]) -> Tuple[int, int]:
+        """Slice bounds of the keys with lo <= year <= hi (caller holds the lock)."""
+        self._merge()
+        keys = self._keys
+        start = 0 if lo is None else bisect_left(keys, lo << DOC_BITS)
+        stop = len(keys) if hi is None else bisect_left(keys, (hi + 1) << DOC_BITS)
+        return start, max(start, stop)
+
+    def range(self, lo: Optional[int] = None, hi: Optional[int] = None) -> List[int]:
+        """Doc ids published in [lo, hi] (inclusive, None = open), oldest first."""
+        with self._lock:
+            start, stop = self._span(lo, hi)
+            if np is not None and stop - start > MERGE_THRESHOLD:
+                keys = np.frombuffer(self._keys, dtype=np.int64)[start:stop]
+                return (keys & DOC_MASK).tolist()
+            return [key & DOC_MASK for key in self._keys[start:stop]]
+
+    def cardinality(self, value) -> int:
+        lo, hi = year_bounds(value)
+        with self._lock:
+            start, stop = self._span(lo, hi)
+        return stop - start
+
+    def bitmap(self, value) -> "Bitmap":
+        """Bitmap of the doc ids matching a year filter (see year_bounds), for filter_bitmap."""
+        from models.bitmap_index import Bitmap
+
+        return Bitmap.from_ids(self.range(*year_bounds(value)))
+
+    def bounds(self) -> Optional[YearRange]:
+        """(oldest, newest) publication year in the catalog, or None when empty."""
+        with self._lock:
+            self._merge()
+            if not self._keys:
+                return None
+            return self._keys[0] >> DOC_BITS, self._keys[-1] >> DOC_BITS
+
+    def __contains__(self, value) -> bool:
+        """True when `value` reads as a year filter (lets FilterSearchStrategy route terms)."""
+        try:
+            year_bounds(value)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys) + len(self._pending)
@@ -0,0 +1,154 @@
+"""
+Weak-reference registries of live items and users.
+
+Constructors register every LibraryItem (by ISBN) and LibraryUser (by
+name) in the current RegistryScope. Registries hold weak references
+only, so throwaway objects (demo data, a get_dummy_items() copy built
+for analytics) disappear from them as soon as nothing else uses them.
+
+An application activates its own scope, bound to its catalog: item
+lookups go to that catalog first, and only objects not cataloged there
+fall back to the weak entries. When no scope is active, the process-wide
+default scope is used.
+"""
+import threading
+import weakref
+from collections import deque
+from typing import Callable, Dict, Generic, Hashable, Iterator, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class WeakRegistry(Generic[T]):
+    """
+    Objects by key, held weakly, with O(1) lookup.
+
+    A key normally holds a single KeyedRef; only duplicate keys get a
+    stack of them, so get() returns the most recently registered object
+    that is still alive, and when a newer duplicate is garbage-collected
+    the older one is visible again instead of lost. Every reference shares
+    one callback, so an entry costs one weakref and one dict slot.
+    An optional `primary` mapping (e.g. a CatalogStore) is consulted first.
+    """
+
+    def __init__(self, key: Callable[[T], Hashable], primary=None):
+        self._key = key
+        self.primary = primary
+        self._refs: Dict[Hashable, Union[weakref.KeyedRef, List[weakref.KeyedRef]]] = {}
+        # weakref callbacks can fire inside any allocation, even while we
+        # hold the lock, so they only queue the dead ref and the next call prunes it
+        self._dead: deque = deque()
+        self._on_dead = self._dead.append
+        self._lock = threading.Lock()
+
+    def register(self, obj: T) -> T:
+        key = self._key(obj)
+        ref = weakref.KeyedRef(obj, self._on_dead, key)
+        with self._lock:
+            self._prune()
+            entry = self._refs.get(key)
+            if entry is None:
+                self._refs[key] = ref
+            elif isinstance(entry, list):
+                if entry[-1]() is not obj:
+                    entry.append(ref)
+            elif entry() is not obj:
+                self._refs[key] = [entry, ref]
+        return obj
+
+    def unregister(self, obj: T):
+        key = self._key(obj)
+        with self._lock:
+            self._keep(key, lambda ref: ref() is not obj)
+
+    def get(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
+        if self.primary is not None:
+            obj = self.primary.get(key)
+            if obj is not None:
+                return obj
+        with self._lock:
+            self._prune()
+            entry = self._refs.get(key)
+            refs = reversed(entry) if isinstance(entry, list) else () if entry is None else (entry,)
+            for ref in refs:
+                obj = ref()
+                if obj is not None:
+                    return obj
+        return default
+
+    def _keep(self, key: Hashable, wanted: Callable[[weakref.KeyedRef], bool]):
+        """Keep only the refs of `key` that satisfy `wanted` (caller holds the lock)."""
+        entry = self._refs.get(key)
+        if entry is None:
+            return
+        refs = [ref for ref in (entry if isinstance(entry, list) else (entry,)) if wanted(ref)]
+        if not refs:
+            del self._refs[key]
+        else:
+            self._refs[key] = refs[0] if len(refs) == 1 else refs
+
+    def _prune(self):
+        """Drop dead references queued by the weakref callbacks (caller holds the lock)."""
+        while self._dead:
+            self._keep(self._dead.popleft().key, lambda ref: ref() is not None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[T]:
+        """The object get() would return for each registered key."""
+        if self.primary is not None:
+            yield from self.primary
+        with self._lock:
+            self._prune()
+            keys = list(self._refs)
+        for key in keys:
+            if self.primary is not None and self.primary.get(key) is not None:
+                continue
+            obj = self.get(key)
+            if obj is not None:
+                yield obj
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class RegistryScope:
+    """The item and user registries of one application instance."""
+
+    def __init__(self, name: str = "", catalog=None):
+        self.name = name
+        self.items: WeakRegistry = WeakRegistry(lambda item: item.isbn, primary=catalog)
+        self.users: WeakRegistry = WeakRegistry(lambda user: user.name)
+
+    def activate(self) -> "RegistryScope":
+        """Make this the current scope for every thread until deactivate()."""
+        with _scopes_lock:
+            _scopes.append(self)
+        return self
+
+    def deactivate(self):
+        with _scopes_lock:
+            if self in _scopes:
+                _scopes.remove(self)
+
+    def __enter__(self) -> "RegistryScope":
+        return self.activate()
+
+    def __exit__(self, *exc):
+        self.deactivate()
+
+    def __repr__(self) -> str:
+        return f"RegistryScope({self.name or 'unnamed'})"
+
+
+# scopes are process-wide, not per thread: the scheduler's threads must
+# resolve ISBNs and user names in the application's scope too
+_default_scope = RegistryScope("default")
+_scopes: List[RegistryScope] = []
+_scopes_lock = threading.Lock()
+
+
+def current_scope() -> RegistryScope:
+    scopes = _scopes
+    return scopes[-1] if scopes else _default_scope
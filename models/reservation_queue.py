@@ -0,0 +1,141 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from models.reservation import Reservation
+
+
+class FenwickTree:
+    """Binary indexed tree over 0-based positions: point update and prefix sum in O(log n)."""
+
+    def __init__(self, size: int = 0, values: Iterable[int] = ()):
+        self._tree = [0] * (size + 1)
+        for i, value in enumerate(values, start=1):
+            self._tree[i] = value
+        # O(n) build: push each partial sum up to its parent once
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int):
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """Sum of positions 0..index inclusive."""
+        i = index + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class ReservationQueue:
+    """
+    FIFO waitlist of reservations for a single ISBN.
+
+    Each entry gets a slot number. A user -> (slot, reservation) map gives
+    O(1) duplicate checks and lookups, and a Fenwick tree over the slots
+    counts the entries still live, so a user's place in line is one
+    O(log n) prefix sum. Cancelled and expired entries are only tombstoned. They are
+    dropped from the head as they surface, and the whole queue is
+    compacted once tombstones outnumber live entries.
+    """
+
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self, reservations: Iterable[Reservation] = ()):
+        self._entries: Deque[Tuple[int, Reservation]] = deque()
+        self._members: Dict[str, Tuple[int, Reservation]] = {}
+        self._live = FenwickTree(16)
+        self._next_slot = 0
+        self._dead = 0
+        for reservation in reservations:
+            self.append(reservation)
+
+    # ─── Mutations ────────────────────────────────────────────────────────────
+    def append(self, reservation: Reservation) -> int:
+        """Add a reservation at the back of the line and return its position (1-based)."""
+        if self._next_slot >= len(self._live):
+            self._rebuild()
+        slot = self._next_slot
+        self._next_slot += 1
+        self._entries.append((slot, reservation))
+        self._members[reservation.user_name] = (slot, reservation)
+        self._live.add(slot, 1)
+        return len(self._members)
+
+    def popleft(self) -> Optional[Reservation]:
+        """Remove and return the first live reservation."""
+        head = self.peek()
+        if head is None:
+            return None
+        slot, _ = self._entries.popleft()
+        del self._members[head.user_name]
+        self._live.add(slot, -1)
+        return head
+
+    def remove(self, user_name: str) -> Optional[Reservation]:
+        """Tombstone the user's live reservation and return it. Status is left to the caller."""
+        member = self._members.pop(user_name, None)
+        if member is None:
+            return None
+        slot, reservation = member
+        self._live.add(slot, -1)
+        self._dead += 1
+        if self._dead >= self.COMPACT_THRESHOLD and self._dead > len(self._members):
+            self._rebuild()
+        return reservation
+
+    # ─── Queries ──────────────────────────────────────────────────────────────
+    def peek(self) -> Optional[Reservation]:
+        """First live reservation, discarding tombstones that reached the head."""
+        while self._entries:
+            slot, reservation = self._entries[0]
+            if self._is_live(slot, reservation):
+                return reservation
+            self._entries.popleft()
+            self._dead -= 1
+        return None
+
+    def find(self, user_name: str) -> Optional[Reservation]:
+        member = self._members.get(user_name)
+        return member[1] if member else None
+
+    def position(self, user_name: str) -> Optional[int]:
+        """1-based place in line among live reservations, or None."""
+        member = self._members.get(user_name)
+        if member is None:
+            return None
+        return self._live.prefix_sum(member[0])
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Reservation]:
+        for slot, reservation in list(self._entries):
+            if self._is_live(slot, reservation):
+                yield reservation
+
+    def __repr__(self) -> str:
+        return repr([str(r) for r in self])
+
+    # ─── Internals ────────────────────────────────────────────────────────────
+    def _is_live(self, slot: int, reservation: Reservation) -> bool:
+        member = self._members.get(reservation.user_name)
+        return member is not None and member[0] == slot
+
+    def _rebuild(self):
+        """Drop tombstones, renumber live entries from 0 and resize the Fenwick tree."""
+        live = [r for r in self]
+        self._entries = deque(enumerate(live))
+        self._members = {r.user_name: (slot, r) for slot, r in self._entries}
+        self._next_slot = len(live)
+        self._dead = 0
+        self._live = FenwickTree(max(16, 2 * len(live)), [1] * len(live))
@@ -0,0 +1,439 @@
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem
+
+_WORD = re.compile(r"\w+")
+
+
+# ─── Text normalization ───────────────────────────────────────────────────────
+def normalize(text: str) -> str:
+    """Case-fold and strip accents, so 'François' and 'francois' index the same."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# ─── Posting lists ────────────────────────────────────────────────────────────
+def intersect(postings: Iterable[Sequence[int]]) -> List[int]:
+    """
+    Intersect sorted doc id lists, smallest first. Each surviving candidate
+    is looked up in the next list by a forward-only binary search, so the
+    cost is driven by the shortest list rather than the longest.
+    """
+    ordered = sorted(postings, key=len)
+    if not ordered:
+        return []
+    result = list(ordered[0])
+    for plist in ordered[1:]:
+        if not result:
+            break
+        matched = []
+        lo, n = 0, len(plist)
+        for doc_id in result:
+            lo = bisect_left(plist, doc_id, lo)
+            if lo == n:
+                break
+            if plist[lo] == doc_id:
+                matched.append(doc_id)
+        result = matched
+    return result
+
+
+def _add_posting(plist: List[int], doc_id: int):
+    # doc ids are handed out in increasing order, so this is almost always an append
+    if not plist or plist[-1] < doc_id:
+        plist.append(doc_id)
+    else:
+        i = bisect_left(plist, doc_id)
+        if i == len(plist) or plist[i] != doc_id:
+            plist.insert(i, doc_id)
+
+
+def _remove_posting(plist: List[int], doc_id: int):
+    i = bisect_left(plist, doc_id)
+    if i < len(plist) and plist[i] == doc_id:
+        del plist[i]
+
+
+# ─── Indexes ──────────────────────────────────────────────────────────────────
+class CatalogIndex:
+    """
+    Base for indexes kept by a CatalogStore. The store calls add/remove with
+    the item's doc id whenever its contents change, and status_changed after
+    LibraryItem.update_status().
+    """
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        raise NotImplementedError
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        raise NotImplementedError
+
+    def status_changed(self, doc_id: int, item: "LibraryItem", old_status):
+        pass
+
+
+class TokenIndex(CatalogIndex):
+    """Inverted index: normalized term -> sorted list of doc ids."""
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+
+    def terms(self, item: "LibraryItem") -> Iterable[str]:
+        raise NotImplementedError
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for term in set(self.terms(item)):
+            _add_posting(self._postings.setdefault(term, []), doc_id)
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        for term in set(self.terms(item)):
+            plist = self._postings.get(term)
+            if plist is None:
+                continue
+            _remove_posting(plist, doc_id)
+            if not plist:
+                del self._postings[term]
+
+    def postings(self, term: str) -> List[int]:
+        return self._postings.get(term, [])
+
+    def cardinality(self, term: str) -> int:
+        return len(self._postings.get(term, ()))
+
+    def search(self, query: str) -> List[int]:
+        """Doc ids containing every term of the query (AND)."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        return intersect(self.postings(term) for term in terms)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+
+class TitleTokenIndex(TokenIndex):
+    def terms(self, item: "LibraryItem") -> Iterable[str]:
+        return tokenize(item.title)
+
+
+class AuthorTrigramIndex(CatalogIndex):
+    """
+    Substring index over author names.
+
+    Each distinct normalized author string is stored once, with the sorted
+    doc ids of the items it appears on, so co-authored and repeat authors
+    share one entry. Trigrams map to the ids of the author strings that
+    contain them. A query is answered by intersecting the postings of its
+    trigrams and confirming each candidate with a real substring test.
+    Queries under three characters have no trigrams and scan the distinct
+    author strings instead, which is still far smaller than the catalog.
+    """
+
+    def __init__(self):
+        self._author_ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._docs: Dict[int, List[int]] = {}       # author id -> doc ids
+        self._grams: Dict[str, List[int]] = {}      # trigram -> author ids
+        self._next_id = 0
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for name in {normalize(a) for a in item.authors}:
+            author_id = self._author_ids.get(name)
+            if author_id is None:
+                author_id = self._author_ids[name] = self._next_id
+                self._next_id += 1
+                self._names[author_id] = name
+                self._docs[author_id] = []
+                for gram in trigrams(name):
+                    _add_posting(self._grams.setdefault(gram, []), author_id)
+            _add_posting(self._docs[author_id], doc_id)
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        for name in {normalize(a) for a in item.authors}:
+            author_id = self._author_ids.get(name)
+            if author_id is None:
+                continue
+            docs = self._docs[author_id]
+            _remove_posting(docs, doc_id)
+            if docs:
+                continue
+            # last item by this author is gone; drop the author string
+            del self._author_ids[name], self._names[author_id], self._docs[author_id]
+            for gram in trigrams(name):
+                plist = self._grams[gram]
+                _remove_posting(plist, author_id)
+                if not plist:
+                    del self._grams[gram]
+
+    def matching_authors(self, query: str) -> List[int]:
+        """Ids of distinct author strings containing the query."""
+        q = normalize(query)
+        grams = trigrams(q)
+        if grams:
+            candidates = intersect(self._grams.get(gram, []) for gram in grams)
+        else:
+            candidates = self._names.keys()
+        return [author_id for author_id in candidates if q in self._names[author_id]]
+
+    def search(self, query: str) -> List[int]:
+        """Sorted doc ids of items with an author containing the query."""
+        doc_ids = set()
+        for author_id in self.matching_authors(query):
+            doc_ids.update(self._docs[author_id])
+        return sorted(doc_ids)
+
+    def cardinality(self, query: str) -> int:
+        return sum(len(self._docs[a]) for a in self.matching_authors(query))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class BM25Index(CatalogIndex):
+    """
+    BM25F ranking over title, author and genre text.
+
+    Per field it keeps term -> parallel arrays of (doc id, term frequency)
+    and the length of every document in that field. At query time each
+    term's frequencies are combined across fields with the field weights,
+    each field length-normalized against its own average, and then
+    saturated once with k1, so a word repeated in several fields does not
+    count several times over.
+    """
+
+    FIELD_WEIGHTS = {"title": 3.0, "authors": 2.0, "genres": 1.0}
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, tuple]] = {f: {} for f in self.FIELD_WEIGHTS}
+        self._lengths: Dict[str, array] = {f: array("H") for f in self.FIELD_WEIGHTS}
+        self._total_length: Dict[str, int] = {f: 0 for f in self.FIELD_WEIGHTS}
+        self._docs = 0
+
+    @staticmethod
+    def field_terms(item: "LibraryItem") -> Dict[str, List[str]]:
+        return {
+            "title": tokenize(item.title),
+            "authors": [t for author in item.authors for t in tokenize(author)],
+            "genres": [t for genre in getattr(item, "genres", ()) for t in tokenize(genre)],
+        }
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for field, terms in self.field_terms(item).items():
+            lengths = self._lengths[field]
+            if len(lengths) <= doc_id:
+                lengths.extend([0] * (doc_id + 1 - len(lengths)))
+            length = min(len(terms), 0xFFFF)
+            lengths[doc_id] = length
+            self._total_length[field] += length
+            postings = self._postings[field]
+            for term, tf in Counter(terms).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("H"))
+                docs, tfs = entry
+                if not docs or docs[-1] < doc_id:
+                    docs.append(doc_id)
+                    tfs.append(min(tf, 0xFFFF))
+                else:
+                    i = bisect_left(docs, doc_id)
+                    docs.insert(i, doc_id)
+                    tfs.insert(i, min(tf, 0xFFFF))
+        self._docs += 1
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        for field, terms in self.field_terms(item).items():
+            self._total_length[field] -= self._lengths[field][doc_id]
+            self._lengths[field][doc_id] = 0
+            postings = self._postings[field]
+            for term in set(terms):
+                entry = postings.get(term)
+                if entry is None:
+                    continue
+                docs, tfs = entry
+                i = bisect_left(docs, doc_id)
+                if i < len(docs) and docs[i] == doc_id:
+                    del docs[i], tfs[i]
+                if not docs:
+                    del postings[term]
+        self._docs -= 1
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25F score of every document matching at least one query term."""
+        n = max(self._docs, 1)
+        norms = {}
+        for field, weight in self.FIELD_WEIGHTS.items():
+            avg = self._total_length[field] / n or 1.0
+            norms[field] = (weight, avg, self._lengths[field])
+
+        k1, b = self.K1, self.B
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            weighted: Dict[int, float] = {}
+            for field, (weight, avg, lengths) in norms.items():
+                entry = self._postings[field].get(term)
+                if entry is None:
+                    continue
+                for doc_id, tf in zip(*entry):
+                    norm = 1.0 - b + b * lengths[doc_id] / avg
+                    weighted[doc_id] = weighted.get(doc_id, 0.0) + weight * tf / norm
+            if not weighted:
+                continue
+            df = len(weighted)
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            for doc_id, wtf in weighted.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * wtf * (k1 + 1.0) / (wtf + k1)
+        return scores
+
+    def top_k(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        The k best (doc id, score) pairs, best first; ties go to catalog order.
+        Selection keeps a bounded heap of k entries instead of sorting every match.
+        """
+        scores = self.scores(query)
+        return heapq.nlargest(k, scores.items(), key=lambda pair: (pair[1], -pair[0]))
+
+
+def levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over words under edit distance. A lookup only
+    descends into children whose edge distance d satisfies
+    |d - dist(query, node)| <= max_distance (triangle inequality), so it
+    visits a small part of the vocabulary.
+    """
+
+    def __init__(self):
+        self._root = None       # [word, {distance: child}]
+        self._size = 0
+
+    def add(self, word: str):
+        if self._root is None:
+            self._root = [word, {}]
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = levenshtein(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [word, {}]
+                self._size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """(word, distance) for every stored word within max_distance."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            d = levenshtein(word, node_word)
+            if d <= max_distance:
+                found.append((node_word, d))
+            for edge, child in children.items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        return found
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class FuzzyIndex(TokenIndex):
+    """
+    Typo-tolerant lookup over title and author words.
+
+    Postings are kept as in TokenIndex; every distinct word also goes into
+    a BK-tree. Words that disappear from the catalog stay in the tree (BK
+    trees cannot delete) and are skipped at lookup; the tree is rebuilt
+    once such dead words outnumber live ones.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._tree = BKTree()
+
+    def terms(self, item: "LibraryItem") -> Iterable[str]:
+        words = tokenize(item.title)
+        for author in item.authors:
+            words.extend(tokenize(author))
+        return words
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for term in set(self.terms(item)):
+            if term not in self._postings:
+                self._tree.add(term)
+        super().add(doc_id, item)
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        super().remove(doc_id, item)
+        if len(self._tree) > 2 * len(self._postings) + 64:
+            self._tree = BKTree()
+            for term in self._postings:
+                self._tree.add(term)
+
+    def similar(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """Live vocabulary words within max_distance; an exact hit short-circuits the tree walk."""
+        if word in self._postings:
+            return [(word, 0)]
+        return [(w, d) for w, d in self._tree.search(word, max_distance) if w in self._postings]
+
+    def search_fuzzy(self, query: str, max_distance: int = 2) -> List[Tuple[int, int]]:
+        """
+        Doc ids matching every query word within max_distance edits,
+        as (doc id, total edits) pairs, closest first.
+        """
+        words = set(tokenize(query))
+        if not words:
+            return []
+        best: Dict[int, int] = {}
+        for n, word in enumerate(words):
+            distances: Dict[int, int] = {}
+            for term, d in self.similar(word, max_distance):
+                for doc_id in self.postings(term):
+                    if d < distances.get(doc_id, max_distance + 1):
+                        distances[doc_id] = d
+            if n == 0:
+                best = distances
+            else:
+                best = {doc_id: best[doc_id] + d for doc_id, d in distances.items() if doc_id in best}
+            if not best:
+                return []
+        return sorted(best.items(), key=lambda pair: (pair[1], pair[0]))
@@ -1,7 +1,7 @@
 from enum import Enum, auto
 from typing import List
 
-active_users = {}
+from models.registry import current_scope
 
 
 class Role(Enum):
@@ -18,7 +18,7 @@ class LibraryUser:
         self.password_hash = password_hash
         self.role = role
         self.current_loans: List[str] = [] 
-        active_users[self.name] = self
+        current_scope().users.register(self)
 
     def can_borrow(self, item_type: str) -> bool:
         if self.role == Role.GUEST:
@@ -60,3 +60,49 @@ class ReserveCommand(Command):
         if self.success:
             success, msg = self.manager.cancel_reservation(self.user, self.item)
             print(f"Undo: {msg}")
+
+
+class BorrowManyCommand(Command):
+    def __init__(self, user, items):
+        self.user = user
+        self.items = list(items)
+        self.results = []
+        self.manager = TransactionManager()
+
+    def execute(self):
+        self.results = self.manager.borrow_many(self.user, self.items)
+        borrowed = sum(1 for _, ok, _ in self.results if ok)
+        print(f"Borrowed {borrowed} of {len(self.results)} items.")
+        for item, ok, msg in self.results:
+            if not ok:
+                print(f"  '{item.title}': {msg}")
+
+    def undo(self):
+        for item, ok, _ in self.results:
+            if ok:
+                success, msg = self.manager.revoke_borrow(self.user, item)
+                print(f"Undo: {msg}")
+
+
+class ReturnManyCommand(Command):
+    def __init__(self, pairs):
+        self.pairs = list(pairs)
+        self.results = []
+        self.manager = TransactionManager()
+
+    def execute(self):
+        self.results = self.manager.return_many(self.pairs)
+        returned = sum(1 for _, _, ok, _ in self.results if ok)
+        print(f"Returned {returned} of {len(self.results)} items.")
+        for user, item, ok, msg in self.results:
+            if not ok:
+                print(f"  '{item.title}' ({user.name}): {msg}")
+
+    def undo(self):
+        by_user = {}
+        for user, item, ok, _ in self.results:
+            if ok:
+                by_user.setdefault(user.name, (user, []))[1].append(item)
+        for user, items in by_user.values():
+            for item, success, msg in self.manager.borrow_many(user, items):
+                print(f"Undo: {msg}")
@@ -1,8 +1,8 @@
 from functools import wraps
-from datetime import datetime, timedelta
 from patterns.observer.notification_center import NotificationCenter
 from models.users import Role
 from models.items import ItemStatus
+from models.registry import current_scope
 
 def with_priority_borrowing(func):
     @wraps(func)
@@ -11,14 +11,15 @@ def with_priority_borrowing(func):
         from patterns.singleton.transaction_manager import TransactionManager
         tm = TransactionManager()
 
-        queue = tm.reservation_queues.get(item.isbn, [])
+        queue = tm.reservation_queues.get(item.isbn)
         first_hold = tm._get_first_active_reservation(item.isbn)
 
         # If reserved by someone else, Faculty skips to front
         if item.status == ItemStatus.RESERVED and first_hold and first_hold.user_name != user.name:
             if user.role == Role.FACULTY:
                 # remove any existing faculty reservation
-                tm.reservation_queues[item.isbn] = [r for r in queue if r.user_name != user.name]
+                if queue.remove(user.name):
+                    tm._log("dequeue", user=user.name, isbn=item.isbn)
                 # free up the book
                 item.update_status(ItemStatus.AVAILABLE)
 
@@ -35,21 +36,21 @@ def with_due_date_reminder(func):
         from patterns.singleton.transaction_manager import TransactionManager
         tm = TransactionManager()
 
-        # scan for any tx due in 1 day
-        for tx in tm.transactions:
-            if tx.status.name == "ACTIVE":
-                days_left = (tx.due_date - datetime.now()).days
-                if days_left == 1:
-                    user = tm._find_user_by_name(tx.user_name)
-                    # find item by ISBN
-                    from models.items import active_items
-                    item = next((i for i in active_items if i.isbn == tx.isbn), None)
-                    if user and item:
-                        NotificationCenter.get_subject().notify(
-                            "due_date_approaching",
-                            user=user,
-                            item=item,
-                            due_date=tx.due_date.date()
-                        )
+        # a background scheduler, when attached, sends reminders itself
+        if tm.scheduler:
+            return result
+
+        # pop loans due in 1 day off the front of the due-date heap
+        items = current_scope().items
+        for tx in tm.pop_due_reminders():
+            user = tm._find_user_by_name(tx.user_name)
+            item = items.get(tx.isbn)
+            if user and item:
+                NotificationCenter.get_subject().notify(
+                    "due_date_approaching",
+                    user=user,
+                    item=item,
+                    due_date=tx.due_date.date()
+                )
         return result
     return wrapper
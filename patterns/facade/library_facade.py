@@ -1,4 +1,6 @@
-from patterns.command.commands import BorrowCommand, ReturnCommand, ReserveCommand
+from patterns.command.commands import (
+    BorrowCommand, ReturnCommand, ReserveCommand, BorrowManyCommand, ReturnManyCommand
+)
 from patterns.command.invoker import CommandInvoker
 from models.items import *
 from models.users import *
@@ -15,6 +17,18 @@ class LibraryFacade:
         cmd = ReturnCommand(user, item)
         self.invoker.execute_command(cmd)
 
+    def borrow_many(self, user: LibraryUser, items):
+        """Self-checkout of several items; returns [(item, ok, msg), ...]."""
+        cmd = BorrowManyCommand(user, items)
+        self.invoker.execute_command(cmd)
+        return cmd.results
+
+    def return_many(self, pairs):
+        """Book-drop return of (user, item) pairs; returns [(user, item, ok, msg), ...]."""
+        cmd = ReturnManyCommand(pairs)
+        self.invoker.execute_command(cmd)
+        return cmd.results
+
     def reserve_book(self, user: LibraryUser, item: LibraryItem):
         cmd = ReserveCommand(user, item)
         self.invoker.execute_command(cmd)
@@ -34,7 +48,6 @@ def main():
 
     # Items
     book = PrintedBook("1984", ["Orwell"], "ISBN0001", ["Dystopia"], 1949, "English", ItemStatus.AVAILABLE, "A1")
-    active_items.append(book)
 
   # 1) Student borrows
     facade.borrow_book(gaurav, book)
@@ -56,5 +69,14 @@ def main():
 
     # 7) Undo all outstanding commands
     facade.undo_all_actions()
+
+    # 8) Kiosk: check out a stack at once, then drop them all back
+    stack = [
+        PrintedBook(f"Kiosk Book {i}", ["Various"], f"KIOSK{i:03d}", ["Reference"], 2001,
+                    "English", ItemStatus.AVAILABLE, "K1")
+        for i in range(4)
+    ]
+    facade.borrow_many(gaurav, stack)
+    facade.return_many([(gaurav, item) for item in stack])
 if __name__ == "__main__":
     main()
\ No newline at end of file
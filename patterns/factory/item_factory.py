@@ -1,4 +1,4 @@
-from typing import Type, Dict
+from typing import Type, Dict, Optional
 from models.items import LibraryItem, EBook, PrintedBook, ResearchPaper, Audiobook, ItemStatus
 
 class LibraryItemFactory:
@@ -9,10 +9,14 @@ class LibraryItemFactory:
         item_type_key = item_type_key.lower()
         LibraryItemFactory._registered_item_classes[item_type_key] = item_class
 
+    @staticmethod
+    def item_class(item_type_key: str) -> Optional[Type[LibraryItem]]:
+        return LibraryItemFactory._registered_item_classes.get(item_type_key.lower())
+
     @staticmethod
     def create(item_type_key: str, **item_data) -> LibraryItem:
         item_type_key = item_type_key.lower()
-        item_class = LibraryItemFactory._registered_item_classes.get(item_type_key)
+        item_class = LibraryItemFactory.item_class(item_type_key)
 
         if not item_class:
             raise ValueError(f"Item type '{item_type_key}' is not registered.")
@@ -9,5 +9,6 @@ class Subject:
         self._observers.remove(observer)
 
     def notify(self, event_type, user=None, item=None, due_date=None):
-        for observer in self._observers:
+        # iterate a copy so observers may detach themselves while being notified
+        for observer in list(self._observers):
             observer.update(event_type, user=user, item=item, due_date=due_date)
@@ -5,6 +5,10 @@ class Singleton:
     _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
+        # fast path: no lock once the instance exists
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
         with cls._lock:
             if cls not in cls._instances:
                 cls._instances[cls] = super(Singleton, cls).__new__(cls, *args, **kwargs)
@@ -1,3 +1,7 @@
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -5,11 +9,14 @@ if TYPE_CHECKING:
 
 from models.users import LibraryUser, Role
 from models.items import LibraryItem, ItemStatus, PrintedBook
+from models.registry import current_scope
 from models.transactions import BorrowingTransaction, TransactionStatus
 from models.reservation import Reservation, ReservationStatus
+from models.reservation_queue import ReservationQueue
 from .singleton import Singleton
 from patterns.observer.notification_center import NotificationCenter
 from patterns.decorator.decorator import with_due_date_reminder, with_priority_borrowing
+from utils.locks import LockManager
 
 
 class TransactionManager(Singleton):
@@ -22,19 +29,70 @@ class TransactionManager(Singleton):
     """
 
     def __init__(self):
+        # lock-free once constructed; the class lock only guards first init
         if hasattr(self, "_initialized"):
             return
-
-        self.transactions = []  
-        self.reservation_queues = {} 
-        self._initialized = True    
+        with self._lock:
+            if hasattr(self, "_initialized"):
+                return
+            self.transactions = []  
+            self.reservation_queues = {}   # isbn -> ReservationQueue
+            # (user_name, isbn) -> the open BorrowingTransaction for that loan
+            self._active_loans = {}
+            # secondary indexes over the same open loans
+            self._active_by_user = {}   # user_name -> {isbn: tx}
+            self._active_by_isbn = {}   # isbn -> {user_name: tx}
+            # user_name -> every transaction the user ever made, oldest first
+            self._history_by_user = {}
+            # min-heap of (due_date, seq, tx) for loans still owed a reminder;
+            # returned/revoked loans are skipped lazily when they reach the top
+            self._due_heap = []
+            self._due_seq = itertools.count()
+            # optional background scheduler that takes over reminders and hold expiry
+            self.scheduler = None
+            # optional write-ahead log every state change is appended to
+            self.wal = None
+            # per-user locks + per-ISBN stripes, always taken users-then-items
+            self.locks = LockManager()
+            self._due_lock = threading.Lock()
+            # per-thread buffers for WAL records, new loans and notifications
+            # while a borrow_many/return_many batch is running
+            self._batch_state = threading.local()
+            self._initialized = True    
+
+    def attach_scheduler(self, scheduler):
+        """Hand due-date reminders and hold expiry over to a background scheduler."""
+        self.scheduler = scheduler
+        pending, self._due_heap = self._due_heap, []
+        for _, _, tx in pending:
+            if tx.status == TransactionStatus.ACTIVE:
+                scheduler.schedule_due_reminder(tx)
+        for isbn, queue in self.reservation_queues.items():
+            hold = self._get_first_active_reservation(isbn)
+            item = self._get_all_items().get(isbn)
+            if hold and item:
+                scheduler.schedule_hold_expiry(item, hold)
+
+    def reset(self):
+        """Drop all transactions, reservations and indexes (used by demos)."""
+        self.transactions.clear()
+        self.reservation_queues.clear()
+        self._active_loans.clear()
+        self._active_by_user.clear()
+        self._active_by_isbn.clear()
+        self._history_by_user.clear()
+        self._due_heap.clear()
 
     # ─── Borrow ────────────────────────────────────────────────────────────────
     @with_due_date_reminder
-    @with_priority_borrowing
     def borrow_item(self,  user: "LibraryUser", item: "LibraryItem"):
+        with self.locks.hold([user.name], [item.isbn]):
+            return self._borrow(user, item)
+
+    @with_priority_borrowing
+    def _borrow(self, user: "LibraryUser", item: "LibraryItem"):
         # 1) If book is RESERVED, only the first active reserver can borrow
-        queue = self.reservation_queues.get(item.isbn, [])
+        queue = self.reservation_queues.get(item.isbn)
         first_hold = self._get_first_active_reservation(item.isbn)
 
         if item.status == ItemStatus.RESERVED:
@@ -42,7 +100,8 @@ class TransactionManager(Singleton):
                 holder = first_hold.user_name if first_hold else "another user"
                 return False, f"Item is reserved for {holder}."
             # consume this reservation
-            queue.pop(0)
+            queue.popleft()
+            self._log("pop", isbn=item.isbn)
             item.update_status(ItemStatus.AVAILABLE)
 
         # 2) Permission and availability checks
@@ -52,6 +111,10 @@ class TransactionManager(Singleton):
         if item.status != ItemStatus.AVAILABLE:
             return False, f"Item is currently {item.status.value}."
 
+        limit = user.get_borrow_limit()
+        if len(user.current_loans) >= limit:
+            return False, f"Borrow limit reached ({limit} items)."
+
         # 3) Create transaction
         days_allowed = user.get_borrow_duration()
         tx = BorrowingTransaction(
@@ -60,29 +123,78 @@ class TransactionManager(Singleton):
             borrow_date=datetime.now(),
             period_days=days_allowed,
         )
-        self.transactions.append(tx)
+        self._record_transaction(tx)
+        self._log("borrow", user=user.name, isbn=item.isbn,
+                  at=tx.borrow_date.isoformat(), days=days_allowed)
 
         # 4) Update user and item
         user.current_loans.append(item.isbn)
         item.update_status(ItemStatus.CHECKED_OUT)
+        # feeds popularity-ranked features such as title autocomplete
+        self._notify('item_borrowed', user=user, item=item)
 
         return True, f"Successfully borrowed '{item.title}'."
 
+    @with_due_date_reminder
+    def borrow_many(self, user: LibraryUser, items):
+        """
+        Check out several items for one user (self-checkout kiosk).
+
+        The user's loan capacity is checked once, all locks are taken once,
+        WAL records and new transactions are appended in bulk and any
+        notifications go out after the batch. Returns [(item, ok, msg), ...]
+        in input order; duplicates of an item already in the batch fail.
+        """
+        items = list(items)
+        limit = user.get_borrow_limit()
+        if len(user.current_loans) >= limit:
+            return [(item, False, f"Borrow limit reached ({limit} items).") for item in items]
+
+        results = []
+        seen = set()
+        with self._batch([user.name], [item.isbn for item in items]):
+            for item in items:
+                if item.isbn in seen:
+                    results.append((item, False, "Item already in this batch."))
+                    continue
+                seen.add(item.isbn)
+                results.append((item, *self._borrow(user, item)))
+        return results
+
     # ─── Return ────────────────────────────────────────────────────────────────
     def return_item(self, user: LibraryUser, item: LibraryItem):
+        with self.locks.hold([user.name], [item.isbn]):
+            return self._return(user, item)
+
+    def _return(self, user: LibraryUser, item: LibraryItem):
         tx = self._find_active_transaction(user.name, item.isbn)
         if not tx:
             return False, "No active borrow found to return."
 
         tx.mark_returned()
+        self._close_transaction(tx)
+        self._log("return", user=user.name, isbn=item.isbn, at=tx.return_date.isoformat())
         user.current_loans.remove(item.isbn)
 
         # Hand off to next reservation or free up the book
         self._process_next_reservation(item)
         return True, f"Successfully returned '{item.title}'."
 
+    def return_many(self, pairs):
+        """
+        Return a batch of (user, item) pairs (book drop). Same batching as
+        borrow_many; returns [(user, item, ok, msg), ...] in input order.
+        """
+        pairs = list(pairs)
+        with self._batch({user.name for user, _ in pairs}, [item.isbn for _, item in pairs]):
+            return [(user, item, *self._return(user, item)) for user, item in pairs]
+
     # ─── Revoke ───────────────────────────────────────────────────────────────
     def revoke_borrow(self, user: LibraryUser, item: LibraryItem):
+        with self.locks.hold([user.name], [item.isbn]):
+            return self._revoke(user, item)
+
+    def _revoke(self, user: LibraryUser, item: LibraryItem):
         tx = self._find_active_transaction(user.name, item.isbn)
         if not tx:
             return False, "No active borrow to revoke."
@@ -92,6 +204,8 @@ class TransactionManager(Singleton):
             return False, "Revoke window (2 hours) has passed."
 
         tx.revoke()
+        self._close_transaction(tx)
+        self._log("revoke", user=user.name, isbn=item.isbn, at=tx.return_date.isoformat())
         user.current_loans.remove(item.isbn)
 
         # After revoke, offer to next reserver
@@ -100,103 +214,334 @@ class TransactionManager(Singleton):
 
     # ─── Reserve ──────────────────────────────────────────────────────────────
     def reserve_item(self, user: LibraryUser, item: LibraryItem):
+        with self.locks.hold([user.name], [item.isbn]):
+            return self._reserve(user, item)
+
+    def _reserve(self, user: LibraryUser, item: LibraryItem):
         if user.role == Role.GUEST:
             return False, "Guests cannot place reservations."
 
         # get or create the queue for this ISBN
-        queue = self.reservation_queues.setdefault(item.isbn, [])
+        queue = self.reservation_queues.get(item.isbn)
+        if queue is None:
+            queue = self.reservation_queues[item.isbn] = ReservationQueue()
 
         # prevent duplicates
-        for r in queue:
-            if r.user_name == user.name and r.status in (
-                ReservationStatus.PENDING,
-                ReservationStatus.ACTIVE,
-            ):
-                return False, "You already have a reservation."
+        existing = queue.find(user.name)
+        if existing and existing.status in (
+            ReservationStatus.PENDING,
+            ReservationStatus.ACTIVE,
+        ):
+            return False, "You already have a reservation."
 
         # add to queue
         new_res = Reservation(user.name, item.isbn, datetime.now())
-        queue.append(new_res)
+        position = queue.append(new_res)
+        self._log("reserve", user=user.name, isbn=item.isbn, at=new_res.request_date.isoformat())
 
         # if first in line and book is free, activate hold now
-        if len(queue) == 1 and item.status == ItemStatus.AVAILABLE:
+        if position == 1 and item.status == ItemStatus.AVAILABLE:
             self._activate_hold(item, new_res)
 
-        position = len(queue)
         return True, f"Reserved '{item.title}'. You are number {position} in queue."
 
     def cancel_reservation(self, user: LibraryUser, item: LibraryItem):
-        queue = self.reservation_queues.get(item.isbn, [])
-        for idx, res in enumerate(queue):
-            if res.user_name == user.name and res.status in (
-                ReservationStatus.PENDING,
-                ReservationStatus.ACTIVE,
-            ):
-                res.cancel()
-                if idx == 0 and res.status == ReservationStatus.CANCELLED:
-                    self._process_next_reservation(item)
-                return True, "Your reservation has been cancelled."
-        return False, "No active reservation found to cancel."
+        with self.locks.hold([user.name], [item.isbn]):
+            return self._cancel(user, item)
+
+    def _cancel(self, user: LibraryUser, item: LibraryItem):
+        queue = self.reservation_queues.get(item.isbn)
+        res = queue.find(user.name) if queue else None
+        if not res or res.status not in (
+            ReservationStatus.PENDING,
+            ReservationStatus.ACTIVE,
+        ):
+            return False, "No active reservation found to cancel."
+
+        # only a cancelled live hold frees the item for the next reserver
+        held = res.status == ReservationStatus.ACTIVE and queue.peek() is res
+        queue.remove(user.name)
+        res.cancel()
+        self._log("cancel", user=user.name, isbn=item.isbn)
+        if held:
+            self._process_next_reservation(item)
+        return True, "Your reservation has been cancelled."
+
+    # ─── Complete ─────────────────────────────────────────────────────────────
+    def complete_transaction(self, tx: BorrowingTransaction):
+        """Close out a loan record without going through the return flow."""
+        with self.locks.hold([tx.user_name], [tx.isbn]):
+            tx.complete_transaction()
+            self._close_transaction(tx)
+            self._log("complete", user=tx.user_name, isbn=tx.isbn, at=tx.return_date.isoformat())
+
+    # ─── Queries ──────────────────────────────────────────────────────────────
+    def get_user_history(self, user_name: str):
+        """All transactions made by a user, oldest first."""
+        return list(self._history_by_user.get(user_name, ()))
+
+    def get_open_transactions(self, user_name: str = None):
+        """Loans not yet returned, revoked or completed (optionally for one user)."""
+        if user_name is not None:
+            return list(self._active_by_user.get(user_name, {}).values())
+        return list(self._active_loans.values())
+
+    def get_open_transactions_for_item(self, isbn: str):
+        return list(self._active_by_isbn.get(isbn, {}).values())
+
+    def pop_due_reminders(self, now: datetime = None):
+        """
+        Pop every loan that is now less than two days from its due date and
+        return the ones due in exactly one day. Each loan is handed out once;
+        inactive loans and loans already inside their last day are dropped.
+        """
+        now = now or datetime.now()
+        horizon = now + timedelta(days=2)
+        due = []
+        with self._due_lock:
+            while self._due_heap and self._due_heap[0][0] < horizon:
+                _, _, tx = heapq.heappop(self._due_heap)
+                if tx.status != TransactionStatus.ACTIVE:
+                    continue
+                if (tx.due_date - now).days == 1:
+                    due.append(tx)
+        return due
 
     # ─── Helpers ───────────────────────────────────────────────────────────────
+    def _record_transaction(self, tx: BorrowingTransaction):
+        self._history_by_user.setdefault(tx.user_name, []).append(tx)
+        self._active_loans[(tx.user_name, tx.isbn)] = tx
+        self._active_by_user.setdefault(tx.user_name, {})[tx.isbn] = tx
+        self._active_by_isbn.setdefault(tx.isbn, {})[tx.user_name] = tx
+        pending = getattr(self._batch_state, "transactions", None)
+        if pending is not None:
+            pending.append(tx)
+        else:
+            self._append_transactions([tx])
+
+    def _append_transactions(self, txs):
+        """Add new loans to the transaction log and the reminder schedule."""
+        self.transactions.extend(txs)
+        if self.scheduler:
+            for tx in txs:
+                self.scheduler.schedule_due_reminder(tx)
+        else:
+            with self._due_lock:
+                for tx in txs:
+                    heapq.heappush(self._due_heap, (tx.due_date, next(self._due_seq), tx))
+
+    @contextmanager
+    def _batch(self, user_names, isbns):
+        """
+        Hold the locks for a whole batch and buffer its side effects.
+
+        WAL records and new transactions are flushed before the locks are
+        released, so the log order still matches the order of changes per
+        item; notifications are sent after the locks are released.
+        """
+        state = self._batch_state
+        state.records, state.transactions, state.notices = [], [], []
+        try:
+            with self.locks.hold(user_names, isbns):
+                try:
+                    yield
+                finally:
+                    records, state.records = state.records, None
+                    txs, state.transactions = state.transactions, None
+                    self._append_transactions(txs)
+                    if records and self.wal:
+                        self.wal.append_many(records)
+        finally:
+            notices, state.notices = state.notices, None
+            for event, kwargs in notices:
+                NotificationCenter.get_subject().notify(event, **kwargs)
+
+    def _notify(self, event: str, **kwargs):
+        notices = getattr(self._batch_state, "notices", None)
+        if notices is not None:
+            notices.append((event, kwargs))
+        else:
+            NotificationCenter.get_subject().notify(event, **kwargs)
+
+    def _close_transaction(self, tx: BorrowingTransaction):
+        key = (tx.user_name, tx.isbn)
+        if self._active_loans.get(key) is not tx:
+            return
+        del self._active_loans[key]
+        by_user = self._active_by_user[tx.user_name]
+        del by_user[tx.isbn]
+        if not by_user:
+            del self._active_by_user[tx.user_name]
+        by_isbn = self._active_by_isbn[tx.isbn]
+        del by_isbn[tx.user_name]
+        if not by_isbn:
+            del self._active_by_isbn[tx.isbn]
+
     def _find_active_transaction(self, user_name, isbn):
-        for tx in reversed(self.transactions):
-            if (
-                tx.user_name == user_name
-                and tx.isbn == isbn
-                and tx.status == TransactionStatus.ACTIVE
-            ):
-                return tx
+        tx = self._active_loans.get((user_name, isbn))
+        if tx and tx.status == TransactionStatus.ACTIVE:
+            return tx
         return None
 
     def _get_first_active_reservation(self, isbn):
-        queue = self.reservation_queues.get(isbn, [])
-        for r in queue:
-            if r.status == ReservationStatus.ACTIVE:
-                return r
+        # holds are only ever granted to the head of the queue
+        queue = self.reservation_queues.get(isbn)
+        head = queue.peek() if queue else None
+        if head and head.status == ReservationStatus.ACTIVE:
+            return head
         return None
 
     def _activate_hold(self, item: LibraryItem, reservation: Reservation):
         """Mark a reservation as active and set book status + notify user."""
         reservation.activate_hold()
         item.update_status(ItemStatus.RESERVED)
+        self._log("hold", user=reservation.user_name, isbn=item.isbn,
+                  until=reservation.expiry_date.isoformat())
+        if self.scheduler:
+            self.scheduler.schedule_hold_expiry(item, reservation)
         
         # Notify the user their reservation is now available
         user = self._find_user_by_name(reservation.user_name)
-        NotificationCenter.get_subject().notify('reservation_available', user=user, item=item)
-
+        self._notify('reservation_available', user=user, item=item)
+
+
+    def expire_hold(self, item: LibraryItem, reservation: Reservation):
+        """Expire a lapsed hold and offer the item to the next pending reserver."""
+        with self.locks.hold(isbns=[item.isbn]):
+            queue = self.reservation_queues.get(item.isbn)
+            if not queue or queue.peek() is not reservation:
+                return False
+            if reservation.status != ReservationStatus.ACTIVE:
+                return False
+            reservation.expire()
+            queue.popleft()
+            self._log("pop", isbn=item.isbn, expire=True)
+            self._process_next_reservation(item)
+            return True
 
     def _process_next_reservation(self, item: LibraryItem):
-        queue = self.reservation_queues.get(item.isbn, [])
+        queue = self.reservation_queues.get(item.isbn)
 
         # 1) Expire active hold if it's over
-        if queue and queue[0].is_hold_over():
-            expired_res = queue[0]
+        if queue and queue.peek().is_hold_over():
+            expired_res = queue.popleft()
             expired_res.expire()
+            self._log("pop", isbn=item.isbn, expire=True)
             # from patterns.observer.notification_center import NotificationCenter
             user = self._find_user_by_name(expired_res.user_name)
             # NotificationCenter.get_subject().notify('reservation_expired', user=user, item=item)
-            queue.pop(0)
 
-        # 2) Promote next pending
+        # 2) Promote next pending, unless the item is still out on loan
+        #    (it is handed over when that loan comes back)
+        if self._active_by_isbn.get(item.isbn):
+            return
         while queue:
-            candidate = queue[0]
+            candidate = queue.peek()
             if candidate.status == ReservationStatus.PENDING:
                 self._activate_hold(item, candidate)
                 return
-            queue.pop(0)
+            queue.popleft()
+            self._log("pop", isbn=item.isbn)
 
         item.update_status(ItemStatus.AVAILABLE)
 
+    # ─── Persistence ──────────────────────────────────────────────────────────
+    def attach_wal(self, wal):
+        """Start appending every borrow/return/revoke/reserve/cancel to `wal`."""
+        self.wal = wal
+
+    def restore_snapshot(self, snapshot):
+        """Load open loans and reservation queues from a services.snapshot.Snapshot."""
+        self.reset()
+        for tx in snapshot.transactions:
+            self._record_transaction(tx)
+        for isbn, reservations in snapshot.reservation_queues.items():
+            self.reservation_queues[isbn] = ReservationQueue(reservations)
+
+    def recover(self, wal, after_lsn: int = 0):
+        """
+        Rebuild transactions and reservation queues by replaying `wal` (only
+        records after `after_lsn`, i.e. the tail behind a snapshot), then log to it.
+        """
+        self.wal = None
+        touched = set()
+        for record in wal.replay(after_lsn):
+            self._apply_record(record)
+            touched.add(record["isbn"])
+        self._restore_item_statuses(touched)
+        for user_name in list(self._active_by_user):
+            user = self._find_user_by_name(user_name)
+            if user:
+                self.sync_user_loans(user)
+        wal.skip_to(after_lsn)
+        self.attach_wal(wal)
+
+    def sync_user_loans(self, user: LibraryUser):
+        """Refresh user.current_loans from the open-loan index (after a restart)."""
+        user.current_loans = list(self._active_by_user.get(user.name, {}))
+
+    def _log(self, op: str, **fields):
+        if not self.wal:
+            return
+        records = getattr(self._batch_state, "records", None)
+        if records is not None:
+            records.append(dict(fields, op=op))
+        else:
+            self.wal.append(op, **fields)
+
+    def _apply_record(self, record: dict):
+        op, user_name, isbn = record["op"], record.get("user"), record["isbn"]
+        at = datetime.fromisoformat(record["at"]) if "at" in record else None
+
+        if op == "borrow":
+            self._record_transaction(BorrowingTransaction(user_name, isbn, at, record["days"]))
+        elif op in ("return", "revoke", "complete"):
+            tx = self._active_loans.get((user_name, isbn))
+            if tx:
+                tx.status = {
+                    "return": TransactionStatus.RETURNED,
+                    "revoke": TransactionStatus.REVOKED,
+                    "complete": TransactionStatus.COMPLETED,
+                }[op]
+                tx.return_date = at
+                self._close_transaction(tx)
+        elif op == "reserve":
+            queue = self.reservation_queues.get(isbn)
+            if queue is None:
+                queue = self.reservation_queues[isbn] = ReservationQueue()
+            queue.append(Reservation(user_name, isbn, at))
+        elif op in ("cancel", "dequeue"):
+            res = self.reservation_queues[isbn].remove(user_name)
+            if res and op == "cancel":
+                res.cancel()
+        elif op == "hold":
+            res = self.reservation_queues[isbn].find(user_name)
+            res.status = ReservationStatus.ACTIVE
+            res.expiry_date = datetime.fromisoformat(record["until"])
+        elif op == "pop":
+            res = self.reservation_queues[isbn].popleft()
+            if res and record.get("expire"):
+                res.expire()
+
+    def _restore_item_statuses(self, isbns):
+        items = self._get_all_items()
+        for isbn in isbns:
+            item = items.get(isbn)
+            if not item:
+                continue
+            if self._active_by_isbn.get(isbn):
+                item.update_status(ItemStatus.CHECKED_OUT)
+            elif self._get_first_active_reservation(isbn):
+                item.update_status(ItemStatus.RESERVED)
+            else:
+                item.update_status(ItemStatus.AVAILABLE)
+
     def _find_user_by_name(self, name: str) -> LibraryUser | None:
-        from models.users import active_users
-        return active_users.get(name)
+        return current_scope().users.get(name)
 
     def _get_all_items(self):
-        # In a real app, fetch from your catalog; here, we can
-        # keep a list you populate at setup (like active_users)
-        from models.items import active_items
-        return active_items
+        # the app's catalog when it has activated a scope, else every live item
+        return current_scope().items
 
 
 
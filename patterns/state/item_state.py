@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from models.items import ItemStatus  
+from patterns.singleton.singleton import Singleton
 
 
-class ItemState(ABC):
+class ItemState(Singleton, ABC):
+    """States hold no data, so each state class has one shared (flyweight) instance."""
+
     @abstractmethod
     def borrow(self, item, user): pass
 
@@ -100,8 +103,7 @@ if __name__ == "__main__":
 
     # 1) Reset singleton storage for a clean run:
     tm = TransactionManager()
-    tm.transactions.clear()
-    tm.reservation_queues.clear()
+    tm.reset()
 
     # 2) Verify Singleton
     print("TransactionManager Singleton works? ", tm is TransactionManager())
@@ -156,7 +158,7 @@ if __name__ == "__main__":
 
     print("\n-- Under Review Behavior --")
     # force into under_review
-    book.status = ItemStatus.UNDER_REVIEW
+    book.update_status(ItemStatus.UNDER_REVIEW)
     book._state = UnderReviewState()
     out(PrintedBook.borrow, alice, book)
     out(PrintedBook.reserve, alice, book)
@@ -0,0 +1,151 @@
+import base64
+import binascii
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ResultPage(Generic[T]):
+    """One page of a result stream, with cursors to its neighbours."""
+
+    __slots__ = ("items", "number", "next_cursor", "prev_cursor")
+
+    def __init__(self, items: List[T], number: int, next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.number = number            # 0-based
+        self.next_cursor = next_cursor  # None on the last page
+        self.prev_cursor = prev_cursor  # None on the first page
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"ResultPage(#{self.number}, {len(self.items)} items, more={self.has_more})"
+
+
+class _Stream:
+    """A suspended result generator plus every item it has produced so far."""
+
+    __slots__ = ("token", "source", "page_size", "fetched", "exhausted", "used_at", "lock")
+
+    def __init__(self, token: str, source: Iterator, page_size: int, now: float):
+        self.token = token
+        self.source = source
+        self.page_size = page_size
+        self.fetched: list = []
+        self.exhausted = False
+        self.used_at = now
+        self.lock = threading.Lock()
+
+    def fill(self, count: int):
+        """Pull from the generator until `count` items are buffered or it runs dry."""
+        while not self.exhausted and len(self.fetched) < count:
+            try:
+                self.fetched.append(next(self.source))
+            except StopIteration:
+                self.exhausted = True
+
+
+class CursorRegistry:
+    """
+    Keeps open result streams behind opaque cursors.
+
+    open() starts a stream from any iterator (normally a strategy's
+    iter_search generator) and returns its first page. A cursor names a
+    stream and a page; fetching page N pulls only the items between the
+    furthest page fetched so far and page N, and earlier pages are served
+    from what was already pulled, so nothing is recomputed.
+
+    At most `max_streams` streams stay open; the least recently used one
+    is dropped first, and streams idle for `ttl` seconds expire. Pages not
+    yet fetched reflect the catalog at the time they are fetched.
+    """
+
+    def __init__(
+        self,
+        max_streams: int = 64,
+        ttl: Optional[float] = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self._clock = clock
+        self._streams: "OrderedDict[str, _Stream]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, source, page_size: int = 20) -> ResultPage:
+        """Start streaming `source` and return its first page."""
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1.")
+        stream = _Stream(secrets.token_urlsafe(9), iter(source), page_size, self._clock())
+        page = self._page(stream, 0)
+        if page.has_more:
+            # single-page results need no cursor state
+            with self._lock:
+                self._streams[stream.token] = stream
+                while len(self._streams) > self.max_streams:
+                    self._streams.popitem(last=False)
+        return page
+
+    def fetch(self, cursor: str, number: Optional[int] = None) -> ResultPage:
+        """
+        The page `cursor` points at, or page `number` (0-based) of the same
+        stream. Raises ValueError for an unknown or expired cursor.
+        """
+        token, page = _decode(cursor)
+        with self._lock:
+            stream = self._streams.get(token)
+            if stream is not None and self.ttl is not None and self._clock() - stream.used_at > self.ttl:
+                del self._streams[token]
+                stream = None
+            if stream is None:
+                raise ValueError("Invalid or expired cursor; run the search again.")
+            self._streams.move_to_end(token)
+            stream.used_at = self._clock()
+        return self._page(stream, page if number is None else number)
+
+    def close(self, cursor: str):
+        token, _ = _decode(cursor)
+        with self._lock:
+            self._streams.pop(token, None)
+
+    def _page(self, stream: _Stream, number: int) -> ResultPage:
+        if number < 0:
+            raise ValueError("Page numbers start at 0.")
+        size = stream.page_size
+        start = number * size
+        with stream.lock:
+            # one extra item tells whether a next page exists
+            stream.fill(start + size + 1)
+            items = stream.fetched[start:start + size]
+            more = len(stream.fetched) > start + size
+        next_cursor = _encode(stream.token, number + 1) if more else None
+        prev_cursor = _encode(stream.token, number - 1) if number else None
+        return ResultPage(items, number, next_cursor, prev_cursor)
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+
+def _encode(token: str, page: int) -> str:
+    return base64.urlsafe_b64encode(f"{token}:{page}".encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        token, page = raw.rsplit(":", 1)
+        return token, int(page)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid or expired cursor; run the search again.")
@@ -0,0 +1,115 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+from models.catalog import CatalogStore
+from models.items import LibraryItem
+
+
+class _Entry:
+    __slots__ = ("catalog", "generation", "stored_at", "results")
+
+    def __init__(self, catalog: CatalogStore, results: List[LibraryItem], now: float, generation: int):
+        self.catalog = weakref.ref(catalog)
+        self.generation = generation
+        self.stored_at = now
+        self.results = results
+
+
+class SearchResultCache:
+    """
+    LRU cache of search results for SearchContext.
+
+    Entries are keyed by (strategy, normalized query, filters) and remember
+    the catalog's generation when they were filled; any add, remove or
+    status change bumps the generation, so a stale entry is never served.
+    Entries also expire after `ttl` seconds. The cache holds at most
+    `max_entries` queries and `max_results` result references in total;
+    least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_results: int = 100_000,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_results = max_results
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._stored = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, catalog: CatalogStore) -> Optional[List[LibraryItem]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stale = entry.catalog() is not catalog or entry.generation != catalog.generation
+            expired = self.ttl is not None and self._clock() - entry.stored_at > self.ttl
+            if stale or expired:
+                self._drop(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.results)
+
+    def put(
+        self,
+        key: Hashable,
+        catalog: CatalogStore,
+        results: List[LibraryItem],
+        generation: Optional[int] = None,
+    ):
+        """
+        Store `results`, computed when the catalog was at `generation`. Pass
+        the generation read before searching: a change that lands during the
+        search then leaves the entry stale instead of stamping old results new.
+        """
+        if generation is None:
+            generation = catalog.generation
+        if len(results) > self.max_results:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(catalog, list(results), self._clock(), generation)
+            self._stored += len(results)
+            while len(self._entries) > self.max_entries or self._stored > self.max_results:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stored = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "stored_results": self._stored,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._stored -= len(entry.results)
+
+    def __len__(self) -> int:
+        return len(self._entries)
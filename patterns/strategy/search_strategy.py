@@ -1,69 +1,392 @@
 # utils/search_strategies.py
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+from models.autocomplete import AutocompleteIndex
+from models.catalog import CatalogStore
 from models.items import LibraryItem
+from models.search_index import (
+    AuthorTrigramIndex,
+    BM25Index,
+    FuzzyIndex,
+    TitleTokenIndex,
+    normalize,
+    tokenize,
+)
+from models.bitmap_index import (
+    FILTER_INDEXES,
+    Bitmap,
+    DecadeBitmapIndex,
+    GenreBitmapIndex,
+    LanguageBitmapIndex,
+    StatusBitmapIndex,
+    TypeBitmapIndex,
+    filter_bitmap,
+)
+from models.range_index import YearRangeIndex
+from patterns.strategy.pagination import CursorRegistry, ResultPage
+from patterns.strategy.search_cache import SearchResultCache
+from services.facets import FacetTotalsIndex
+from services.query_engine import QueryEngine, parse_query
 from utils.dummy_data import get_dummy_items
 
+if TYPE_CHECKING:
+    from services.sharded_search import ShardedCatalog
+
+# indexes the indexed strategies read; built up front by build_search_indexes()
+SEARCH_INDEXES = (
+    TitleTokenIndex,
+    AuthorTrigramIndex,
+    GenreBitmapIndex,
+    TypeBitmapIndex,
+    LanguageBitmapIndex,
+    StatusBitmapIndex,
+    DecadeBitmapIndex,
+    YearRangeIndex,
+    FacetTotalsIndex,
+    BM25Index,
+    FuzzyIndex,
+    AutocompleteIndex,
+)
+
+
+def build_search_indexes(catalog: CatalogStore):
+    """Build every search index at catalog load instead of on the first query."""
+    for index_cls in SEARCH_INDEXES:
+        catalog.index(index_cls)
+
+
+def autocomplete(catalog: CatalogStore, prefix: str, limit: int = 5) -> List[str]:
+    """Most-borrowed titles and authors with a word starting with `prefix`."""
+    return catalog.index(AutocompleteIndex).complete(prefix, limit)
+
+
+def _as_catalog(items) -> CatalogStore:
+    # indexes live on a CatalogStore; plain lists get a throwaway one
+    return items if isinstance(items, CatalogStore) else CatalogStore(items)
+
+
+def _docs(catalog: CatalogStore, doc_ids) -> Iterator[LibraryItem]:
+    """Items for doc ids, looked up lazily; ids removed in the meantime are skipped."""
+    for doc_id in doc_ids:
+        item = catalog.doc(doc_id)
+        if item is not None:
+            yield item
+
 
 class SearchStrategy(ABC):
     @abstractmethod
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        """Yield the items matching the query, in result order, as they are found."""
+        ...
+
     def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
         """Return the subset of items matching the query."""
-        ...
+        return list(self.iter_search(items, query))
+
+    def iter_ranked(self, items: List[LibraryItem], query: str) -> Iterator[Tuple[float, LibraryItem]]:
+        """
+        (rank key, item) pairs in result order, lower keys first. Used to merge
+        results found in separate catalog shards; unranked strategies use 0
+        for every item and keep catalog order.
+        """
+        return ((0, item) for item in self.iter_search(items, query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        """
+        Doc ids of every match as a Bitmap (for facet counts). Index-backed
+        strategies return their index postings or bitmaps without touching
+        items; the result may be an index's own bitmap, so do not modify it.
+        """
+        catalog = _as_catalog(items)
+        doc_ids = map(catalog.doc_id, (item.isbn for item in self.iter_search(catalog, query)))
+        return Bitmap.from_ids(doc_id for doc_id in doc_ids if doc_id is not None)
+
+    def cache_key(self) -> tuple:
+        """Identifies this strategy and its settings in a SearchResultCache."""
+        return (type(self).__name__,) + tuple(sorted(vars(self).items()))
 
 
 class KeywordSearchStrategy(SearchStrategy):
     """Search for items whose title contains the query (case-insensitive)."""
-    def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
         q = query.lower()
-        return [item for item in items if q in item.title.lower()]
+        return (item for item in items if q in item.title.lower())
+
+
+class IndexedKeywordSearchStrategy(SearchStrategy):
+    """
+    Title search through the catalog's inverted token index. Every word of
+    the query must appear in the title (case- and accent-insensitive).
+    """
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        catalog = _as_catalog(items)
+        if not tokenize(query):
+            # like the substring search, an empty query matches everything
+            return iter(catalog)
+        return _docs(catalog, catalog.index(TitleTokenIndex).search(query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        catalog = _as_catalog(items)
+        if not tokenize(query):
+            return Bitmap.from_ids(doc_id for doc_id, _ in catalog.docs())
+        return Bitmap.from_ids(catalog.index(TitleTokenIndex).search(query))
 
 
 class AuthorSearchStrategy(SearchStrategy):
     """Search for items by matching author name (case-insensitive)."""
-    def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
         q = query.lower()
-        return [
+        return (
             item
             for item in items
             if any(q in author.lower() for author in item.authors)
-        ]
+        )
+
+
+class IndexedAuthorSearchStrategy(SearchStrategy):
+    """
+    Author substring search through the catalog's trigram index; same
+    matches as AuthorSearchStrategy, without scanning every item.
+    """
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        catalog = _as_catalog(items)
+        return _docs(catalog, catalog.index(AuthorTrigramIndex).search(query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        return Bitmap.from_ids(_as_catalog(items).index(AuthorTrigramIndex).search(query))
 
 
 class TypeSearchStrategy(SearchStrategy):
     """Search for items by their item_type() string (case-insensitive)."""
-    def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
         q = query.lower()
-        return [item for item in items if q == item.item_type().lower()]
+        return (item for item in items if q == item.item_type().lower())
 
 
 class GenreSearchStrategy(SearchStrategy):
     """Search for items by genre (case-insensitive, matches any genre tag)."""
-    def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
         q = query.lower()
-        return [
+        return (
             item
             for item in items
             if hasattr(item, "genres") and any(q == g.lower() for g in item.genres)
-        ]
+        )
+
+
+class IndexedTypeSearchStrategy(SearchStrategy):
+    """Item type lookup from the catalog's type bitmap; no per-item item_type() calls."""
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        catalog = _as_catalog(items)
+        return _docs(catalog, self.result_bitmap(catalog, query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        return _as_catalog(items).index(TypeBitmapIndex).bitmap(query)
+
+
+class IndexedGenreSearchStrategy(SearchStrategy):
+    """Genre lookup from the catalog's genre bitmap."""
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        catalog = _as_catalog(items)
+        return _docs(catalog, self.result_bitmap(catalog, query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        return _as_catalog(items).index(GenreBitmapIndex).bitmap(query)
+
+
+class FilterSearchStrategy(SearchStrategy):
+    """
+    Combined filters such as "Fantasy AND E-Book AND 1950..1980". Each term
+    is looked up in the genre, type, language and status bitmaps and the
+    year range index (a term found in several is OR-ed across them) and
+    the terms are AND-ed.
+    """
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        catalog = _as_catalog(items)
+        return _docs(catalog, self.result_bitmap(catalog, query))
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        catalog = _as_catalog(items)
+        terms = [t.strip() for t in query.replace(" and ", " AND ").split(" AND ") if t.strip()]
+        if not terms:
+            return Bitmap()
+        bitmaps = []
+        for term in terms:
+            bitmap = Bitmap()
+            for index_cls in FILTER_INDEXES.values():
+                index = catalog.index(index_cls)
+                if term in index:
+                    bitmap = bitmap | index.bitmap(term)
+            bitmaps.append(bitmap)
+        bitmaps.sort(key=len)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap
+        return result
+
+
+class QuerySearchStrategy(SearchStrategy):
+    """
+    Multi-field queries such as "author:tolkien genre:fantasy year:>1950 available",
+    planned over all catalog indexes (see services.query_engine).
+    Raises ValueError for malformed queries.
+    """
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        return QueryEngine(_as_catalog(items)).iter_search(query)
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        engine = QueryEngine(_as_catalog(items))
+        return Bitmap.from_ids(engine.execute(engine.plan(parse_query(query))))
+
+    def explain(self, items: List[LibraryItem], query: str) -> str:
+        return QueryEngine(_as_catalog(items)).explain(query)
+
+
+class RankedSearchStrategy(SearchStrategy):
+    """
+    Relevance-ranked full-text search: BM25 over title, author and genre
+    (title weighted highest). Returns at most `k` items, best first.
+    """
+    def __init__(self, k: int = 10):
+        self.k = k
+
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        return (item for item, _ in self.search_with_scores(items, query))
+
+    def iter_ranked(self, items: List[LibraryItem], query: str) -> Iterator[Tuple[float, LibraryItem]]:
+        return ((-score, item) for item, score in self.search_with_scores(items, query))
+
+    def search_with_scores(self, items: List[LibraryItem], query: str) -> List[Tuple[LibraryItem, float]]:
+        catalog = _as_catalog(items)
+        ranked = catalog.index(BM25Index).top_k(query, self.k)
+        return [(catalog.doc(doc_id), score) for doc_id, score in ranked]
+
+
+class FuzzySearchStrategy(SearchStrategy):
+    """
+    Typo-tolerant title/author search ("Pragmatc Programer"). Every query
+    word must match a title or author word within `max_distance` edits;
+    words spelled correctly are matched exactly without the fuzzy pass.
+    Closest matches come first.
+    """
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+
+    def iter_search(self, items: List[LibraryItem], query: str) -> Iterator[LibraryItem]:
+        return (item for _, item in self.iter_ranked(items, query))
+
+    def iter_ranked(self, items: List[LibraryItem], query: str) -> Iterator[Tuple[float, LibraryItem]]:
+        catalog = _as_catalog(items)
+        for doc_id, edits in catalog.index(FuzzyIndex).search_fuzzy(query, self.max_distance):
+            item = catalog.doc(doc_id)
+            if item is not None:
+                yield edits, item
+
+    def result_bitmap(self, items: List[LibraryItem], query: str) -> Bitmap:
+        index = _as_catalog(items).index(FuzzyIndex)
+        return Bitmap.from_ids(doc_id for doc_id, _ in index.search_fuzzy(query, self.max_distance))
 
 
 class SearchContext:
-    """Holds a reference to a SearchStrategy and delegates searches to it."""
-    def __init__(self, strategy: SearchStrategy):
+    """
+    Holds a reference to a SearchStrategy and delegates searches to it.
+
+    Optional keyword filters (genre, item_type, language, status, decade,
+    and year as a year or (from, to) pair) narrow any strategy's results
+    through the catalog's bitmap and year range indexes. With a
+    SearchResultCache, repeated searches on a CatalogStore are answered
+    from the cache until the catalog changes.
+
+    paginate() streams results a page at a time behind opaque cursors;
+    fetch_page() continues from a cursor without recomputing the pages
+    before it.
+
+    With a ShardedCatalog, searches on its catalog are scattered to the
+    shard worker processes and their partial top-k results merged.
+    """
+    def __init__(
+        self,
+        strategy: SearchStrategy,
+        cache: Optional[SearchResultCache] = None,
+        shards: Optional["ShardedCatalog"] = None,
+    ):
         self._strategy = strategy
+        self.cache = cache
+        self.shards = shards
+        self.cursors = CursorRegistry()
 
     def set_strategy(self, strategy: SearchStrategy):
         self._strategy = strategy
 
-    def search(self, items: List[LibraryItem], query: str) -> List[LibraryItem]:
-        return self._strategy.search(items, query)
+    def search(self, items: List[LibraryItem], query: str, **filters) -> List[LibraryItem]:
+        filters = {field: value for field, value in filters.items() if value is not None}
+        key = self._cache_key(items, query, filters)
+        if key is None:
+            return list(self._iter_search(items, query, filters))
+        results = self.cache.get(key, items)
+        if results is None:
+            generation = items.generation
+            results = list(self._iter_search(items, query, filters))
+            self.cache.put(key, items, results, generation)
+        return results
+
+    def iter_search(self, items: List[LibraryItem], query: str, **filters) -> Iterator[LibraryItem]:
+        """Results one at a time: from the cache when it has them, otherwise never materialized."""
+        filters = {field: value for field, value in filters.items() if value is not None}
+        key = self._cache_key(items, query, filters)
+        if key is not None:
+            cached = self.cache.get(key, items)
+            if cached is not None:
+                return iter(cached)
+        return self._iter_search(items, query, filters)
+
+    def result_bitmap(self, items: List[LibraryItem], query: str, **filters) -> Bitmap:
+        """All matches as a Bitmap of doc ids, for FacetEngine.counts(); no result list is built."""
+        filters = {field: value for field, value in filters.items() if value is not None}
+        catalog = _as_catalog(items)
+        if self.shards is not None and items is self.shards.catalog:
+            # the shards hold the indexes; map their merged results back to doc ids
+            doc_ids = map(catalog.doc_id, (item.isbn for item in self._iter_search(items, query, filters)))
+            return Bitmap.from_ids(doc_id for doc_id in doc_ids if doc_id is not None)
+        bitmap = self._strategy.result_bitmap(catalog, query)
+        allowed = filter_bitmap(catalog, **filters)
+        return bitmap if allowed is None else bitmap & allowed
+
+    def paginate(self, items: List[LibraryItem], query: str, page_size: int = 20, **filters) -> ResultPage:
+        """First page of results; hand its next_cursor to fetch_page() for the rest."""
+        return self.cursors.open(self.iter_search(items, query, **filters), page_size)
+
+    def fetch_page(self, cursor: str, number: Optional[int] = None) -> ResultPage:
+        """The page `cursor` points at, or page `number` (0-based) of the same search."""
+        return self.cursors.fetch(cursor, number)
+
+    def _cache_key(self, items, query: str, filters: dict) -> Optional[tuple]:
+        if self.cache is None or not isinstance(items, CatalogStore):
+            return None
+        return (
+            self._strategy.cache_key(),
+            normalize(" ".join(query.split())),
+            tuple(sorted((field, normalize(str(getattr(value, "value", value))))
+                         for field, value in filters.items())),
+        )
+
+    def _iter_search(self, items, query: str, filters: dict) -> Iterator[LibraryItem]:
+        if self.shards is not None and items is self.shards.catalog:
+            k = getattr(self._strategy, "k", None)
+            return iter(self.shards.search(self._strategy, query, filters, k))
+        results = self._strategy.iter_search(items, query)
+        if not filters:
+            return results
+        catalog = _as_catalog(items)
+        allowed = filter_bitmap(catalog, **filters)
+        return (item for item in results if catalog.doc_id(item.isbn) in allowed)
 
 
 def main():
-    items = get_dummy_items()
-    context = SearchContext(KeywordSearchStrategy())
+    items = CatalogStore(get_dummy_items())
+    build_search_indexes(items)
+    context = SearchContext(IndexedKeywordSearchStrategy())
 
     while True:
         print("\nChoose search type:")
@@ -71,30 +394,50 @@ def main():
         print("  2) Author")
         print("  3) Item type")
         print("  4) Genre")
-        print("  5) Exit")
-        choice = input("Enter choice [1-5]: ").strip()
+        print("  5) Filters (e.g. Fantasy AND E-Book AND 1950..1980)")
+        print("  6) Query (e.g. author:tolkien genre:fantasy year:>1950 available)")
+        print("  7) Best matches (ranked)")
+        print("  8) Fuzzy (tolerates typos)")
+        print("  9) Exit")
+        choice = input("Enter choice [1-9]: ").strip()
 
-        if choice == "5":
+        if choice == "9":
             print("Goodbye!")
             break
         elif choice == "1":
-            context.set_strategy(KeywordSearchStrategy())
+            context.set_strategy(IndexedKeywordSearchStrategy())
             prompt = "Enter keyword to search in titles: "
         elif choice == "2":
-            context.set_strategy(AuthorSearchStrategy())
+            context.set_strategy(IndexedAuthorSearchStrategy())
             prompt = "Enter author name to search: "
         elif choice == "3":
-            context.set_strategy(TypeSearchStrategy())
+            context.set_strategy(IndexedTypeSearchStrategy())
             prompt = "Enter item type (e.g. E-Book, Printed Book): "
         elif choice == "4":
-            context.set_strategy(GenreSearchStrategy())
+            context.set_strategy(IndexedGenreSearchStrategy())
             prompt = "Enter genre to search (e.g. Fantasy, AI, Python): "
+        elif choice == "5":
+            context.set_strategy(FilterSearchStrategy())
+            prompt = "Enter filters joined by AND: "
+        elif choice == "6":
+            context.set_strategy(QuerySearchStrategy())
+            prompt = "Enter query: "
+        elif choice == "7":
+            context.set_strategy(RankedSearchStrategy())
+            prompt = "Enter search words: "
+        elif choice == "8":
+            context.set_strategy(FuzzySearchStrategy())
+            prompt = "Enter title or author words: "
         else:
             print("Invalid choice, please try again.")
             continue
 
         query = input(prompt).strip()
-        results = context.search(items, query)
+        try:
+            results = context.search(items, query)
+        except ValueError as exc:
+            print(exc)
+            continue
 
         print(f"\nResults ({len(results)} found):")
         if results:
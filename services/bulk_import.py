@@ -0,0 +1,317 @@
+"""
+Streaming bulk import of catalog items from CSV or JSONL feeds.
+
+Rows are read lazily and handled a chunk at a time: each chunk is
+validated (the builders' base-field rules plus the fields the item class
+requires), turned into items through LibraryItemFactory, and applied to
+the catalog a chunk at a time; every new or changed item updates the
+indexes as it is applied. Items are upserted by ISBN: a row for an ISBN
+already in the catalog updates that item in place (same object, so loans,
+holds and scheduled timers keep pointing at it) and keeps its
+circulation status; changing an item's type is rejected. Only one chunk and
+a bounded sample of rejected rows are held at a time, so memory use does
+not grow with the size of the file.
+
+Expected columns: type (a registered factory key, e.g. "printedbook" or
+"Printed Book"), title, authors, isbn, genres, publication_year, language,
+an optional status, and the type's own field (file_format,
+shelf_location, duration_minutes or journal). In CSV, authors and genres
+are ";"-separated; in JSONL they may also be lists.
+"""
+import csv
+import inspect
+import json
+import os
+import re
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from models.catalog import CatalogStore
+from models.items import Audiobook, EBook, ItemStatus, LibraryItem, PrintedBook, ResearchPaper
+from patterns.builder.builder import LibraryItemBuilder
+from patterns.factory.item_factory import LibraryItemFactory
+from patterns.state.item_state import AvailableState, CheckedOutState, ReservedState, UnderReviewState
+from utils.config import IMPORT_CHUNK_SIZE
+
+BASE_FIELDS = ("title", "authors", "isbn", "genres", "publication_year", "language", "status")
+
+_STATES = {
+    ItemStatus.AVAILABLE: AvailableState,
+    ItemStatus.CHECKED_OUT: CheckedOutState,
+    ItemStatus.RESERVED: ReservedState,
+    ItemStatus.UNDER_REVIEW: UnderReviewState,
+}
+
+# (line number, raw row): a dict for CSV, the unparsed line for JSONL
+RawRow = Tuple[int, object]
+
+
+class ImportReport:
+    """Running totals of one import; rejected rows beyond MAX_REJECTIONS are only counted."""
+
+    MAX_REJECTIONS = 100
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self.rows = 0
+        self.added = 0
+        self.updated = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.rejections: List[Tuple[int, str]] = []
+        self._started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, line: int, reason: str):
+        self.rejected += 1
+        if len(self.rejections) < self.MAX_REJECTIONS:
+            self.rejections.append((line, reason))
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def _tick(self):
+        self.elapsed = time.perf_counter() - self._started
+
+    def __str__(self):
+        return (
+            f"{self.rows} rows in {self.elapsed:.1f}s ({self.rows_per_second:,.0f} rows/s): "
+            f"{self.added} added, {self.updated} updated, {self.rejected} rejected"
+        )
+
+
+# ─── Readers ──────────────────────────────────────────────────────────────────
+def read_csv(path: str) -> Iterator[RawRow]:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def read_jsonl(path: str) -> Iterator[RawRow]:
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line.strip():
+                yield line_no, line
+
+
+READERS = {".csv": read_csv, ".jsonl": read_jsonl, ".ndjson": read_jsonl}
+
+
+def read_rows(path: str) -> Iterator[RawRow]:
+    reader = READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"Unsupported import file '{path}': expected {', '.join(READERS)}.")
+    return reader(path)
+
+
+# ─── Field parsing ────────────────────────────────────────────────────────────
+def _type_key(value) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(value or "").lower())
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _values(value) -> List[str]:
+    parts = value if isinstance(value, (list, tuple)) else _text(value).split(";")
+    return [text for text in map(_text, parts) if text]
+
+
+def _int(value, field: str) -> Optional[int]:
+    text = _text(value)
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid {field} '{text}'") from None
+
+
+def _status(value) -> ItemStatus:
+    text = _text(value)
+    if not text:
+        return ItemStatus.AVAILABLE
+    for status in ItemStatus:
+        if text.lower() in (status.value.lower(), status.name.lower()):
+            return status
+    raise ValueError(f"Invalid status '{text}'")
+
+
+_extra_fields: Dict[type, List[Tuple[str, type]]] = {}
+
+
+def extra_fields(item_class: Type[LibraryItem]) -> List[Tuple[str, type]]:
+    """(name, annotation) of the constructor arguments a subclass adds to the base fields."""
+    fields = _extra_fields.get(item_class)
+    if fields is None:
+        params = inspect.signature(item_class.__init__).parameters.values()
+        fields = _extra_fields[item_class] = [
+            (p.name, p.annotation) for p in params if p.name != "self" and p.name not in BASE_FIELDS
+        ]
+    return fields
+
+
+class CatalogImporter:
+    """Streams rows into a CatalogStore chunk by chunk."""
+
+    def __init__(self, catalog: CatalogStore, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.catalog = catalog
+        self.chunk_size = max(1, chunk_size)
+        self._base = LibraryItemBuilder()
+
+    def import_file(self, path: str, on_chunk: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        return self.import_rows(read_rows(path), on_chunk, source=path)
+
+    def import_rows(
+        self,
+        rows: Iterable[RawRow],
+        on_chunk: Optional[Callable[[ImportReport], None]] = None,
+        source: str = "",
+    ) -> ImportReport:
+        """Import (line number, row) pairs; `on_chunk` gets the report after every chunk."""
+        report = ImportReport(source)
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._apply(self._validate(chunk, report), report)
+            report.rows += len(chunk)
+            report.chunks += 1
+            report._tick()
+            if on_chunk:
+                on_chunk(report)
+        report._tick()
+        return report
+
+    # ─── Per chunk ────────────────────────────────────────────────────────────
+    def _validate(self, chunk: List[RawRow], report: ImportReport) -> Dict[str, Tuple[int, LibraryItem]]:
+        """Valid rows of the chunk as (line, item) by ISBN (a later row for the same ISBN wins)."""
+        items: Dict[str, Tuple[int, LibraryItem]] = {}
+        for line, raw in chunk:
+            try:
+                item = self._build(raw)
+            except (ValueError, TypeError) as e:
+                report.reject(line, str(e))
+                continue
+            if item.isbn in items:
+                report.updated += 1
+            items[item.isbn] = line, item
+        return items
+
+    def _build(self, raw) -> LibraryItem:
+        try:
+            row = json.loads(raw) if isinstance(raw, str) else raw
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}") from None
+        if not isinstance(row, dict):
+            raise ValueError("Row is not an object")
+
+        key = _type_key(row.get("type"))
+        item_class = LibraryItemFactory.item_class(key)
+        if item_class is None:
+            raise ValueError(f"Item type '{_text(row.get('type'))}' is not registered.")
+
+        # same required-field rules as building an item by hand
+        base = self._base
+        base.with_title(_text(row.get("title")))
+        base.set_authors(_values(row.get("authors")))
+        base.with_isbn(_text(row.get("isbn")))
+        base.set_genres(_values(row.get("genres")))
+        base.with_publication_year(_int(row.get("publication_year"), "publication year"))
+        base.with_language(_text(row.get("language")))
+        base.with_status(_status(row.get("status")))
+        base._validate_base_fields()
+
+        data = {
+            "title": base._title,
+            "authors": base._authors,
+            "isbn": base._isbn,
+            "genres": base._genres,
+            "publication_year": base._publication_year,
+            "language": base._language,
+            "status": base._status,
+        }
+        for name, annotation in extra_fields(item_class):
+            value = _int(row.get(name), name) if annotation is int else _text(row.get(name))
+            if value is None or value == "":
+                raise ValueError(f"{name} is required for item type '{key}'")
+            data[name] = value
+        return LibraryItemFactory.create(key, **data)
+
+    def _apply(self, items: Dict[str, Tuple[int, LibraryItem]], report: ImportReport):
+        added = []
+        for isbn, (line, item) in items.items():
+            existing = self.catalog.get(isbn)
+            if existing is None:
+                item._state = _STATES[item.status]()
+                added.append(item)
+                report.added += 1
+            elif type(existing) is not type(item):
+                report.reject(line, f"ISBN {isbn} is cataloged as {existing.item_type()}, not {item.item_type()}")
+            else:
+                # the row's values, already normalized by the constructor;
+                # status stays: loans and holds belong to the library, not the feed
+                fields = {name: getattr(item, name) for name in BASE_FIELDS if name not in ("isbn", "status")}
+                fields.update((name, getattr(item, name)) for name, _ in extra_fields(type(item)))
+                self.catalog.update(existing, **fields)
+                report.updated += 1
+        self.catalog.extend(added)
+
+
+def register_item_types():
+    LibraryItemFactory.register("ebook", EBook)
+    LibraryItemFactory.register("printedbook", PrintedBook)
+    LibraryItemFactory.register("researchpaper", ResearchPaper)
+    LibraryItemFactory.register("audiobook", Audiobook)
+
+
+def main():
+    import tempfile
+
+    from utils.dummy_data import get_dummy_items
+
+    register_item_types()
+    catalog = CatalogStore(get_dummy_items())
+    existing = next(iter(catalog))
+    existing.update_status(ItemStatus.CHECKED_OUT)
+
+    rows = [
+        {"type": "printedbook", "title": "Dune", "authors": "Frank Herbert", "isbn": "9780441013593",
+         "genres": "Science Fiction;Classic", "publication_year": "1965", "language": "English",
+         "shelf_location": "B3"},
+        {"type": "E-Book", "title": f"{existing.title} (2nd ed.)", "authors": ";".join(existing.authors),
+         "isbn": existing.isbn, "genres": ";".join(existing.genres), "publication_year": "2021",
+         "language": "English", "file_format": "EPUB"},
+        {"type": "audiobook", "title": "Untimed", "authors": "Anon", "isbn": "9780000000001",
+         "genres": "Poetry", "publication_year": "2001", "language": "English", "duration_minutes": ""},
+        {"type": "magazine", "title": "Monthly", "authors": "Staff", "isbn": "9780000000002",
+         "genres": "News", "publication_year": "2020", "language": "English"},
+        {"type": "researchpaper", "title": "No Authors", "authors": "", "isbn": "9780000000003",
+         "genres": "AI", "publication_year": "2019", "language": "English", "journal": "JMLR"},
+    ]
+    fieldnames = ["type", *BASE_FIELDS, "file_format", "shelf_location", "duration_minutes", "journal"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        report = CatalogImporter(catalog, chunk_size=2).import_file(
+            path, on_chunk=lambda r: print(f"  chunk {r.chunks}: {r.rows} rows")
+        )
+
+    print(report)
+    for line, reason in report.rejections:
+        print(f"  line {line}: {reason}")
+    updated = catalog.get(existing.isbn)
+    print(f"Updated in place: {updated.title} [{updated.status.value}] (same object: {updated is existing})")
+    print(f"Catalog now holds {len(catalog)} items")
+
+
+if __name__ == "__main__":
+    main()
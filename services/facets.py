@@ -0,0 +1,179 @@
+"""
+Facet counts (genre, type, language, decade, status) for search results.
+
+Counts come straight from the catalog's bitmap indexes: a search's
+matches arrive as a Bitmap of doc ids (SearchContext.result_bitmap(),
+built from the strategy's index postings) and every facet value is a
+popcount of its intersection with that value's bitmap, so no LibraryItem
+is touched and no result list is built.
+Whole-catalog totals are kept by FacetTotalsIndex, which the catalog
+updates on every add, remove and status change.
+"""
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from models.bitmap_index import (
+    Bitmap,
+    BitmapIndex,
+    DecadeBitmapIndex,
+    GenreBitmapIndex,
+    LanguageBitmapIndex,
+    StatusBitmapIndex,
+    TypeBitmapIndex,
+)
+from models.catalog import CatalogStore
+from models.search_index import CatalogIndex
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem
+
+FACETS = {
+    "genre": GenreBitmapIndex,
+    "type": TypeBitmapIndex,
+    "language": LanguageBitmapIndex,
+    "decade": DecadeBitmapIndex,
+    "status": StatusBitmapIndex,
+}
+
+# display value(s) of each facet for one item; keys come from the facet index
+FACET_LABELS = {
+    "genre": lambda item: getattr(item, "genres", ()),
+    "type": lambda item: [item.item_type()],
+    "language": lambda item: [item.language],
+    "decade": lambda item: [f"{item.publication_year // 10 * 10}s"],
+    "status": lambda item: [item.status.value],
+}
+
+FacetCounts = Dict[str, List[Tuple[str, int]]]
+
+
+class FacetTotalsIndex(CatalogIndex):
+    """Per-facet value counts over the whole catalog, maintained incrementally."""
+
+    def __init__(self):
+        self._probes: Dict[str, BitmapIndex] = {facet: cls() for facet, cls in FACETS.items()}
+        self._counts: Dict[str, Counter] = {facet: Counter() for facet in FACETS}
+        self._labels: Dict[str, Dict[Hashable, str]] = {facet: {} for facet in FACETS}
+
+    def _keyed(self, facet: str, item: "LibraryItem") -> Dict[Hashable, str]:
+        # keys_of() and the labels list the same values in the same order
+        keyed: Dict[Hashable, str] = {}
+        for key, label in zip(self._probes[facet].keys_of(item), FACET_LABELS[facet](item)):
+            keyed.setdefault(key, label)
+        return keyed
+
+    def _count(self, facet: str, item: "LibraryItem", delta: int):
+        counts = self._counts[facet]
+        labels = self._labels[facet]
+        for key, label in self._keyed(facet, item).items():
+            n = counts[key] + delta
+            if n > 0:
+                counts[key] = n
+                if key not in labels:
+                    labels[key] = label
+            else:
+                counts.pop(key, None)
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        for facet in FACETS:
+            self._count(facet, item, 1)
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        for facet in FACETS:
+            self._count(facet, item, -1)
+
+    def status_changed(self, doc_id: int, item: "LibraryItem", old_status):
+        counts = self._counts["status"]
+        counts[old_status] -= 1
+        if counts[old_status] <= 0:
+            del counts[old_status]
+        self._count("status", item, 1)
+
+    def keys(self, facet: str) -> List[Hashable]:
+        return list(self._counts[facet])
+
+    def label(self, facet: str, key: Hashable) -> str:
+        return self._labels[facet].get(key, str(key))
+
+    def totals(self, facet: str) -> List[Tuple[str, int]]:
+        return [(self.label(facet, key), n) for key, n in self._counts[facet].most_common()]
+
+
+class FacetEngine:
+    """Facet counts over one catalog's indexes."""
+
+    def __init__(self, catalog: CatalogStore):
+        self.catalog = catalog
+
+    def totals(self, facets: Iterable[str] = FACETS, limit: Optional[int] = None) -> FacetCounts:
+        """Counts over the whole catalog, most common first; O(values), no scan."""
+        index = self.catalog.index(FacetTotalsIndex)
+        return {facet: index.totals(facet)[:limit] for facet in facets}
+
+    def counts(
+        self,
+        results: Union[Bitmap, Iterable["LibraryItem"]],
+        facets: Iterable[str] = FACETS,
+        limit: Optional[int] = None,
+    ) -> FacetCounts:
+        """
+        Counts over a result set, most common first, values with no matches
+        left out. Pass a Bitmap of doc ids (SearchContext.result_bitmap())
+        for a whole search: each count is then a popcount per bitmap
+        container, whatever the number of matches. A list of items (e.g.
+        one page) is mapped to doc ids first.
+        """
+        if not isinstance(results, Bitmap):
+            results = Bitmap.from_ids(
+                doc_id for doc_id in map(self.catalog.doc_id, (item.isbn for item in results))
+                if doc_id is not None
+            )
+        totals = self.catalog.index(FacetTotalsIndex)
+        counts: FacetCounts = {}
+        for facet in facets:
+            index = self.catalog.index(FACETS[facet])
+            pairs = []
+            if results:
+                for key in totals.keys(facet):
+                    n = results.intersection_count(index.bitmap(key))
+                    if n:
+                        pairs.append((totals.label(facet, key), n))
+            pairs.sort(key=lambda pair: (-pair[1], pair[0]))
+            counts[facet] = pairs[:limit]
+        return counts
+
+
+def format_facets(counts: FacetCounts, limit: int = 5) -> str:
+    """One line per facet, e.g. 'Genre: Fantasy (3), AI (2)'."""
+    lines = []
+    for facet, pairs in counts.items():
+        if pairs:
+            shown = ", ".join(f"{label} ({n})" for label, n in pairs[:limit])
+            lines.append(f"{facet.capitalize():<9}: {shown}")
+    return "\n".join(lines)
+
+
+def main():
+    from models.items import ItemStatus
+    from patterns.strategy.search_strategy import IndexedKeywordSearchStrategy, build_search_indexes
+    from utils.dummy_data import get_dummy_items
+
+    catalog = CatalogStore(get_dummy_items())
+    build_search_indexes(catalog)
+    engine = FacetEngine(catalog)
+
+    print("Whole catalog:")
+    print(format_facets(engine.totals()))
+
+    results = IndexedKeywordSearchStrategy().search(catalog, "python")
+    print(f"\n'python' ({len(results)} results):")
+    print(format_facets(engine.counts(results)))
+
+    item = results[0]
+    item.update_status(ItemStatus.CHECKED_OUT)
+    print(f"\nAfter checking out '{item.title}':")
+    print(format_facets(engine.totals(["status"])))
+
+
+if __name__ == "__main__":
+    main()
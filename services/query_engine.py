@@ -0,0 +1,314 @@
+"""
+Multi-field catalog queries, e.g.
+
+    author:tolkien genre:fantasy year:>1950 available
+
+Fields: title, author, genre, type, language, status and year (with
+=, >, >=, <, <= or a FROM..TO range). Bare words are title terms, except
+status words such as "available" or "reserved". Quote values with
+spaces: type:"printed book".
+
+The planner asks every index for the number of items a predicate
+matches and runs the most selective predicate first. Each later
+predicate is either intersected from its index or checked item by item
+against the surviving candidates, whichever is estimated to be cheaper.
+"""
+import shlex
+import time
+from typing import Iterator, List, Optional
+
+from models.bitmap_index import (
+    Bitmap,
+    GenreBitmapIndex,
+    LanguageBitmapIndex,
+    StatusBitmapIndex,
+    TypeBitmapIndex,
+)
+from models.catalog import CatalogStore
+from models.items import LibraryItem
+from models.range_index import YearRangeIndex, year_bounds
+from models.search_index import AuthorTrigramIndex, TitleTokenIndex, normalize, tokenize
+
+# checking one candidate item in Python costs a few index-entry visits
+VERIFY_COST = 4
+
+
+# ─── Predicates ───────────────────────────────────────────────────────────────
+class Predicate:
+    """One `field:value` condition. Indexed predicates can produce a Bitmap."""
+
+    indexed = True
+
+    def estimate(self, catalog: CatalogStore) -> int:
+        raise NotImplementedError
+
+    def bitmap(self, catalog: CatalogStore) -> Bitmap:
+        raise NotImplementedError
+
+    def matches(self, item: LibraryItem) -> bool:
+        raise NotImplementedError
+
+
+class TitlePredicate(Predicate):
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+
+    def estimate(self, catalog):
+        index = catalog.index(TitleTokenIndex)
+        return min(index.cardinality(term) for term in self.terms)
+
+    def bitmap(self, catalog):
+        return Bitmap.from_ids(catalog.index(TitleTokenIndex).search(" ".join(self.terms)))
+
+    def matches(self, item):
+        words = set(tokenize(item.title))
+        return all(term in words for term in self.terms)
+
+    def __str__(self):
+        return f"title has {' '.join(self.terms)!r}"
+
+
+class AuthorPredicate(Predicate):
+    def __init__(self, text: str):
+        self.text = normalize(text)
+        self._doc_ids = None
+
+    def _search(self, catalog):
+        if self._doc_ids is None:
+            self._doc_ids = catalog.index(AuthorTrigramIndex).search(self.text)
+        return self._doc_ids
+
+    def estimate(self, catalog):
+        return len(self._search(catalog))
+
+    def bitmap(self, catalog):
+        return Bitmap.from_ids(self._search(catalog))
+
+    def matches(self, item):
+        return any(self.text in normalize(author) for author in item.authors)
+
+    def __str__(self):
+        return f"author ~ {self.text!r}"
+
+
+class BitmapPredicate(Predicate):
+    def __init__(self, field: str, index_cls, value: str):
+        self.field = field
+        self.index_cls = index_cls
+        self.value = value
+        self._probe = index_cls()
+        self._key = self._probe.key(value)
+        self._bitmap = None
+
+    def bitmap(self, catalog):
+        if self._bitmap is None:
+            self._bitmap = catalog.index(self.index_cls).bitmap(self.value)
+        return self._bitmap
+
+    def estimate(self, catalog):
+        return len(self.bitmap(catalog))
+
+    def matches(self, item):
+        return self._key in self._probe.keys_of(item)
+
+    def __str__(self):
+        return f"{self.field} = {self.value!r}"
+
+
+class YearPredicate(Predicate):
+    """publication_year between lo and hi (inclusive, None = open), from the year range index."""
+
+    def __init__(self, lo: Optional[int], hi: Optional[int]):
+        self.lo = lo
+        self.hi = hi
+
+    def estimate(self, catalog):
+        return catalog.index(YearRangeIndex).cardinality((self.lo, self.hi))
+
+    def bitmap(self, catalog):
+        return catalog.index(YearRangeIndex).bitmap((self.lo, self.hi))
+
+    def matches(self, item):
+        year = item.publication_year
+        return (self.lo is None or year >= self.lo) and (self.hi is None or year <= self.hi)
+
+    def __str__(self):
+        if self.lo == self.hi:
+            return f"year = {self.lo}"
+        if self.hi is None:
+            return f"year >= {self.lo}"
+        if self.lo is None:
+            return f"year <= {self.hi}"
+        return f"year in {self.lo}..{self.hi}"
+
+
+# ─── Parser ───────────────────────────────────────────────────────────────────
+BITMAP_FIELDS = {
+    "genre": GenreBitmapIndex,
+    "type": TypeBitmapIndex,
+    "language": LanguageBitmapIndex,
+    "lang": LanguageBitmapIndex,
+    "status": StatusBitmapIndex,
+}
+
+
+def _parse_year(text: str) -> YearPredicate:
+    return YearPredicate(*year_bounds(text))
+
+
+def parse_query(query: str) -> List[Predicate]:
+    """Turn a query string into predicates. Raises ValueError on bad syntax."""
+    try:
+        words = shlex.split(query)
+    except ValueError as exc:
+        raise ValueError(f"Invalid query: {exc}.")
+
+    predicates: List[Predicate] = []
+    title_terms: List[str] = []
+    statuses = StatusBitmapIndex()
+    for word in words:
+        field, sep, value = word.partition(":")
+        if not sep:
+            if statuses.key(word.replace("-", " ")) is not None:
+                predicates.append(BitmapPredicate("status", StatusBitmapIndex, word.replace("-", " ")))
+            else:
+                title_terms.extend(tokenize(word))
+            continue
+        field = field.lower()
+        if not value:
+            raise ValueError(f"Missing value for '{field}'.")
+        if field == "title":
+            title_terms.extend(tokenize(value))
+        elif field == "author":
+            predicates.append(AuthorPredicate(value))
+        elif field == "year":
+            predicates.append(_parse_year(value))
+        elif field in BITMAP_FIELDS:
+            if field == "status" and statuses.key(value) is None:
+                raise ValueError(f"Unknown status '{value}'.")
+            predicates.append(BitmapPredicate(field, BITMAP_FIELDS[field], value))
+        else:
+            raise ValueError(f"Unknown field '{field}'.")
+    if title_terms:
+        predicates.append(TitlePredicate(title_terms))
+    return predicates
+
+
+# ─── Planner / executor ───────────────────────────────────────────────────────
+class PlanStep:
+    __slots__ = ("predicate", "access", "estimate", "ran", "rows", "seconds")
+
+    def __init__(self, predicate: Predicate, access: str, estimate: int):
+        self.predicate = predicate
+        self.access = access        # "index", "verify" or "scan"
+        self.estimate = estimate
+        self.ran = False
+        self.rows = 0
+        self.seconds = 0.0
+
+
+class QueryEngine:
+    """Plans and runs parsed queries against one catalog's indexes."""
+
+    def __init__(self, catalog: CatalogStore):
+        self.catalog = catalog
+
+    def plan(self, predicates: List[Predicate]) -> List[PlanStep]:
+        """
+        Order predicates by estimated result size (smallest drives) and pick
+        an access method for each: intersect the index bitmap, or verify
+        the surviving candidates one by one when that is cheaper.
+        """
+        estimated = sorted(
+            ((p.estimate(self.catalog), p) for p in predicates),
+            key=lambda pair: (not pair[1].indexed, pair[0]),
+        )
+        steps = []
+        total = max(len(self.catalog), 1)
+        candidates = float(total)
+        for estimate, predicate in estimated:
+            if not steps:
+                access = "index" if predicate.indexed else "scan"
+            elif predicate.indexed and estimate < candidates * VERIFY_COST:
+                access = "index"
+            else:
+                access = "verify"
+            steps.append(PlanStep(predicate, access, estimate))
+            # assume predicates are independent when sizing what survives
+            candidates *= estimate / total
+        return steps
+
+    def execute(self, steps: List[PlanStep]) -> List[int]:
+        """Run a plan; returns matching doc ids in catalog order."""
+        if not steps:
+            return [doc_id for doc_id, _ in self.catalog.docs()]
+        result: Optional[Bitmap] = None
+        doc_ids: Optional[List[int]] = None
+        for step in steps:
+            start = time.perf_counter()
+            predicate = step.predicate
+            if step.access == "index":
+                bitmap = predicate.bitmap(self.catalog)
+                result = bitmap if result is None else result & bitmap
+                doc_ids = None
+            else:
+                if doc_ids is None:
+                    doc_ids = list(result) if result is not None else [
+                        doc_id for doc_id, _ in self.catalog.docs()
+                    ]
+                doc_ids = [d for d in doc_ids if predicate.matches(self.catalog.doc(d))]
+                result = None
+            step.rows = len(doc_ids) if doc_ids is not None else len(result)
+            step.seconds = time.perf_counter() - start
+            step.ran = True
+            if not step.rows:
+                return []
+        return doc_ids if doc_ids is not None else list(result)
+
+    def search(self, query: str) -> List[LibraryItem]:
+        return list(self.iter_search(query))
+
+    def iter_search(self, query: str) -> Iterator[LibraryItem]:
+        """Plans and executes immediately (so bad queries raise here); items are looked up lazily."""
+        doc_ids = self.execute(self.plan(parse_query(query)))
+        return (item for item in map(self.catalog.doc, doc_ids) if item is not None)
+
+    def explain(self, query: str) -> str:
+        """Run the query and describe the chosen plan with per-step rows and timings."""
+        steps = self.plan(parse_query(query))
+        start = time.perf_counter()
+        doc_ids = self.execute(steps)
+        total = time.perf_counter() - start
+
+        lines = [f"Query: {query}", f"  {'#':>2}  {'predicate':<32} {'access':<7} {'est.':>8} {'rows':>8} {'ms':>8}"]
+        for n, step in enumerate(steps, start=1):
+            rows = f"{step.rows:>8}" if step.ran else f"{'-':>8}"
+            ms = f"{step.seconds * 1000:>8.3f}" if step.ran else f"{'skipped':>8}"
+            lines.append(
+                f"  {n:>2}  {str(step.predicate):<32} {step.access:<7} {step.estimate:>8} {rows} {ms}"
+            )
+        lines.append(f"Result: {len(doc_ids)} items in {total * 1000:.3f} ms")
+        return "\n".join(lines)
+
+
+def main():
+    from patterns.strategy.search_strategy import build_search_indexes
+    from utils.dummy_data import get_dummy_items
+
+    catalog = CatalogStore(get_dummy_items())
+    build_search_indexes(catalog)
+    engine = QueryEngine(catalog)
+    for query in (
+        "author:tolkien genre:fantasy year:>1950 available",
+        "genre:ai type:e-book python",
+        'type:"research paper" year:2010..2020',
+        "available",
+    ):
+        print(engine.explain(query))
+        for item in engine.search(query):
+            print(f"    {item.isbn} | {item.title} ({item.publication_year})")
+        print()
+
+
+if __name__ == "__main__":
+    main()
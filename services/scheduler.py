@@ -0,0 +1,286 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from models.registry import current_scope
+from models.reservation import ReservationStatus
+from models.transactions import TransactionStatus
+from patterns.observer.notification_center import NotificationCenter
+
+
+# ─── Clocks ───────────────────────────────────────────────────────────────────
+class SystemClock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class ManualClock:
+    """Clock that only moves when told to; used to drive the scheduler in demos/tests."""
+
+    def __init__(self, start: datetime = None):
+        self._now = start or datetime.now()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def advance(self, delta: timedelta):
+        self._now += delta
+
+    def set(self, when: datetime):
+        self._now = when
+
+
+# ─── Timer wheel ──────────────────────────────────────────────────────────────
+class Timer:
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: int, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class HierarchicalTimerWheel:
+    """
+    Hashed hierarchical timer wheel.
+
+    Level 0 holds timers due within `slots` ticks, level 1 within slots**2
+    ticks, and so on; timers further out than the top level wait in an
+    overflow list. Scheduling and cancelling are O(1). When a lower level
+    wraps around, the matching slot of the level above is cascaded down.
+    Empty stretches are skipped instead of being walked tick by tick.
+    """
+
+    def __init__(
+        self,
+        origin: datetime,
+        tick: timedelta = timedelta(seconds=1),
+        slots: int = 64,
+        levels: int = 4,
+    ):
+        self._origin = origin
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._wheels: List[List[List[Timer]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._counts = [0] * levels
+        self._overflow: List[Timer] = []
+        self._current = 0
+        self._lock = threading.Lock()
+
+    def _to_tick(self, when: datetime) -> int:
+        # round up so a timer never fires before its deadline
+        return -((self._origin - when) // self._tick)
+
+    def schedule(self, when: datetime, callback: Callable[[], None]) -> Timer:
+        with self._lock:
+            timer = Timer(max(self._to_tick(when), self._current + 1), callback)
+            self._insert(timer)
+        return timer
+
+    def __len__(self) -> int:
+        return sum(self._counts) + len(self._overflow)
+
+    def _insert(self, timer: Timer):
+        delta = timer.deadline - self._current
+        span = self._slots
+        for level in range(self._levels):
+            if delta < span:
+                idx = (timer.deadline // (span // self._slots)) % self._slots
+                self._wheels[level][idx].append(timer)
+                self._counts[level] += 1
+                return
+            span *= self._slots
+        self._overflow.append(timer)
+
+    def _cascade(self, level: int):
+        """Re-insert the slot of `level` that the current tick has reached."""
+        width = self._slots ** level
+        idx = (self._current // width) % self._slots
+        if idx == 0:
+            if level + 1 < self._levels:
+                self._cascade(level + 1)
+            else:
+                self._reinsert_overflow()
+        bucket = self._wheels[level][idx]
+        self._wheels[level][idx] = []
+        self._counts[level] -= len(bucket)
+        for timer in bucket:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def _reinsert_overflow(self):
+        """Give overflow timers another try once the top level has wrapped around."""
+        pending, self._overflow = self._overflow, []
+        for timer in pending:
+            if not timer.cancelled:
+                self._insert(timer)
+
+    def _next_tick(self, target: int) -> int:
+        """Furthest tick we can jump to without skipping a non-empty slot."""
+        width = 1
+        for level in range(self._levels):
+            if self._counts[level]:
+                break
+            width *= self._slots
+        nxt = (self._current // width + 1) * width
+        return min(nxt, target)
+
+    def advance(self, now: datetime) -> int:
+        """Move the wheel up to `now` and run every expired timer. Returns how many fired."""
+        fired: List[Timer] = []
+        with self._lock:
+            target = self._to_tick(now)
+            if now < self._origin + self._tick * target:
+                target -= 1
+            while self._current < target:
+                self._current = self._next_tick(target)
+                if self._current % self._slots == 0:
+                    if self._levels > 1:
+                        self._cascade(1)
+                    else:
+                        # level 0 is the top level, so its wrap is the overflow's turn
+                        self._reinsert_overflow()
+                idx = self._current % self._slots
+                bucket = self._wheels[0][idx]
+                if bucket:
+                    self._wheels[0][idx] = []
+                    self._counts[0] -= len(bucket)
+                    fired.extend(t for t in bucket if not t.cancelled)
+
+        for timer in fired:
+            try:
+                timer.callback()
+            except Exception as exc:
+                print(f"Scheduler: timer callback failed: {exc}")
+        return len(fired)
+
+
+# ─── Library scheduler ───────────────────────────────────────────────────────
+class LibraryScheduler:
+    """
+    Runs due-date reminders and hold expiries off the request path.
+
+    TransactionManager hands new loans and newly activated holds to the
+    scheduler; a background thread (or explicit run_pending() calls when
+    driven by a ManualClock) advances the timer wheel and fires them.
+    """
+
+    def __init__(
+        self,
+        tm=None,
+        clock=None,
+        poll_interval: float = 1.0,
+        tick: timedelta = timedelta(seconds=1),
+    ):
+        from patterns.singleton.transaction_manager import TransactionManager
+
+        self.tm = tm or TransactionManager()
+        self.clock = clock or SystemClock()
+        self.poll_interval = poll_interval
+        self.wheel = HierarchicalTimerWheel(self.clock.now(), tick=tick)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.tm.attach_scheduler(self)
+
+    # ─── Scheduling ───────────────────────────────────────────────────────────
+    def schedule_due_reminder(self, tx) -> Optional[Timer]:
+        """Remind the borrower a day before `tx` is due; loans already past due get no reminder."""
+        if tx.due_date < self.clock.now():
+            return None
+        when = tx.due_date - timedelta(days=1)
+        return self.wheel.schedule(when, lambda: self._remind(tx))
+
+    def schedule_hold_expiry(self, item, reservation) -> Timer:
+        return self.wheel.schedule(
+            reservation.expiry_date, lambda: self._expire_hold(item, reservation)
+        )
+
+    def schedule_every(self, interval: timedelta, callback: Callable[[], None]) -> Timer:
+        """Run `callback` every `interval`, starting one interval from now."""
+        def run():
+            try:
+                callback()
+            finally:
+                self.wheel.schedule(self.clock.now() + interval, run)
+        return self.wheel.schedule(self.clock.now() + interval, run)
+
+    # ─── Callbacks ────────────────────────────────────────────────────────────
+    def _remind(self, tx):
+        if tx.status != TransactionStatus.ACTIVE:
+            return
+        user = self.tm._find_user_by_name(tx.user_name)
+        item = current_scope().items.get(tx.isbn)
+        if user and item:
+            NotificationCenter.get_subject().notify(
+                "due_date_approaching",
+                user=user,
+                item=item,
+                due_date=tx.due_date.date(),
+            )
+
+    def _expire_hold(self, item, reservation):
+        if reservation.status != ReservationStatus.ACTIVE:
+            return
+        if self.clock.now() < reservation.expiry_date:
+            return
+        self.tm.expire_hold(item, reservation)
+
+    # ─── Driving ──────────────────────────────────────────────────────────────
+    def run_pending(self) -> int:
+        return self.wheel.advance(self.clock.now())
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="library-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.run_pending()
+
+
+def main():
+    from models.users import LibraryUser, Role
+    from models.items import PrintedBook, ItemStatus
+    from patterns.singleton.transaction_manager import TransactionManager
+
+    tm = TransactionManager()
+    tm.reset()
+    clock = ManualClock()
+    scheduler = LibraryScheduler(tm, clock=clock)
+
+    gaurav = LibraryUser("gaurav", "gaurav@example.com", "hash1", Role.STUDENT)
+    mohsin = LibraryUser("mohsin", "mohsin@example.com", "hash2", Role.RESEARCHER)
+    book = PrintedBook("1984", ["George Orwell"], "ISBN0001", ["Dystopian"], 1949,
+                       "English", ItemStatus.AVAILABLE, "A1")
+
+    print("=== Hold expiry ===")
+    print("gaurav reserves:", tm.reserve_item(gaurav, book)[1])
+    print("mohsin reserves:", tm.reserve_item(mohsin, book)[1])
+    clock.advance(timedelta(days=2, minutes=1))
+    print("Timers fired   :", scheduler.run_pending())
+    print("Queue now      :", [str(r) for r in tm.reservation_queues[book.isbn]])
+    print("Book status    :", book.status.name)
+
+    print("\n=== Due-date reminder ===")
+    print("mohsin borrows :", tm.borrow_item(mohsin, book)[1])
+    clock.advance(timedelta(days=20))
+    print("Timers fired   :", scheduler.run_pending())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Catalog search sharded across worker processes.
+
+Each item is assigned to one of N shards by a hash of its ISBN; every
+shard is a worker process with its own CatalogStore and indexes, so
+searches run on N cores instead of one GIL. A query is scattered to all
+shards, each returns its best `k` matches as (rank key, ISBN), and the
+parent merges those into the global top k.
+
+The parent catalog feeds the shards incrementally: adds, removes and
+status changes are queued per shard and shipped in batches before the
+next search, so a search always sees every change made before it.
+
+BM25 scores are computed from each shard's own term statistics. ISBN
+hashing spreads items evenly, so on large catalogs these match the
+global statistics closely, but rankings can differ slightly from an
+unsharded search on small ones.
+"""
+import heapq
+import itertools
+import multiprocessing
+import threading
+import zlib
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from models.bitmap_index import filter_bitmap
+from models.catalog import CatalogStore
+from models.search_index import CatalogIndex
+
+if TYPE_CHECKING:
+    from models.items import LibraryItem
+    from patterns.strategy.search_strategy import SearchStrategy
+
+BATCH_SIZE = 1_000      # catalog changes per message to a worker
+FLUSH_EVERY = 10_000    # queued changes per shard that trigger a flush without a search
+
+
+def shard_of(isbn: str, shards: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process
+    return zlib.crc32(isbn.encode("utf-8")) % shards
+
+
+# ─── Worker process ───────────────────────────────────────────────────────────
+def _apply(catalog: CatalogStore, ops: list):
+    for op, arg, status in ops:
+        if op == "add":
+            catalog.add(arg)
+        elif op == "remove":
+            catalog.remove(arg)
+        else:
+            item = catalog.get(arg)
+            if item is not None:
+                item.update_status(status)
+
+
+def _search(catalog: CatalogStore, strategy: "SearchStrategy", query: str, filters: dict, k: Optional[int]):
+    ranked = strategy.iter_ranked(catalog, query)
+    if filters:
+        allowed = filter_bitmap(catalog, **filters)
+        ranked = ((key, item) for key, item in ranked if catalog.doc_id(item.isbn) in allowed)
+    return [(key, item.isbn) for key, item in itertools.islice(ranked, k)]
+
+
+def _worker(conn):
+    catalog = CatalogStore()
+    while True:
+        message = conn.recv()
+        kind = message[0]
+        if kind == "apply":
+            _apply(catalog, message[1])
+        elif kind == "search":
+            try:
+                conn.send(("ok", _search(catalog, *message[1:])))
+            except Exception as exc:
+                conn.send(("error", type(exc).__name__, str(exc)))
+        elif kind == "count":
+            conn.send(("ok", len(catalog)))
+        elif kind == "stop":
+            conn.close()
+            return
+
+
+# ─── Parent side ──────────────────────────────────────────────────────────────
+class _ShardFeed(CatalogIndex):
+    """Attached to the parent catalog; queues every change for the owning shard."""
+
+    def __init__(self, shards: "ShardedCatalog"):
+        self._shards = shards
+
+    def add(self, doc_id: int, item: "LibraryItem"):
+        self._shards._queue(item.isbn, ("add", item, None))
+
+    def remove(self, doc_id: int, item: "LibraryItem"):
+        self._shards._queue(item.isbn, ("remove", item.isbn, None))
+
+    def status_changed(self, doc_id: int, item: "LibraryItem", old_status):
+        self._shards._queue(item.isbn, ("status", item.isbn, item.status))
+
+
+class ShardedCatalog:
+    """
+    N worker processes each holding the slice of `catalog` whose ISBNs
+    hash to it. Use as a context manager, or call close() to stop them.
+    """
+
+    def __init__(self, catalog: CatalogStore, workers: Optional[int] = None):
+        self.catalog = catalog
+        self.workers = workers or multiprocessing.cpu_count()
+        ctx = multiprocessing.get_context("spawn")  # no fork: the parent runs lock-holding threads
+        self._conns = []
+        self._processes = []
+        for _ in range(self.workers):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+        self._pending: List[list] = [[] for _ in range(self.workers)]
+        self._pending_lock = threading.Lock()
+        self._lock = threading.Lock()       # one scatter/gather or flush on the pipes at a time
+        self._feed = _ShardFeed(self)
+        catalog.attach(self._feed)
+        self.sync()
+
+    # ─── Updates ──────────────────────────────────────────────────────────────
+    def _queue(self, isbn: str, op: tuple):
+        shard = shard_of(isbn, self.workers)
+        with self._pending_lock:
+            self._pending[shard].append(op)
+            full = len(self._pending[shard]) >= FLUSH_EVERY
+        if full and self._lock.acquire(blocking=False):
+            try:
+                self._flush()
+            finally:
+                self._lock.release()
+
+    def _flush(self):
+        """Send queued changes to every shard (caller holds self._lock)."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, [[] for _ in range(self.workers)]
+        for conn, ops in zip(self._conns, pending):
+            for start in range(0, len(ops), BATCH_SIZE):
+                conn.send(("apply", ops[start:start + BATCH_SIZE]))
+
+    def sync(self):
+        """Ship all queued changes and wait until every shard has applied them."""
+        with self._lock:
+            self._flush()
+            for conn in self._conns:
+                conn.send(("count",))
+            for conn in self._conns:
+                conn.recv()
+
+    def sizes(self) -> List[int]:
+        """Items held by each shard."""
+        with self._lock:
+            self._flush()
+            for conn in self._conns:
+                conn.send(("count",))
+            return [conn.recv()[1] for conn in self._conns]
+
+    # ─── Search ───────────────────────────────────────────────────────────────
+    def search(
+        self,
+        strategy: "SearchStrategy",
+        query: str,
+        filters: Optional[dict] = None,
+        k: Optional[int] = None,
+    ) -> List["LibraryItem"]:
+        """
+        Scatter the query to every shard, gather each shard's first `k`
+        (all when None) and merge by rank key, then catalog order.
+        """
+        with self._lock:
+            self._flush()
+            for conn in self._conns:
+                conn.send(("search", strategy, query, filters or {}, k))
+            replies = [conn.recv() for conn in self._conns]
+        for reply in replies:
+            if reply[0] == "error":
+                _, name, message = reply
+                raise (ValueError if name == "ValueError" else RuntimeError)(message)
+
+        merged: List[Tuple[float, int, str]] = []
+        for _, hits in replies:
+            for key, isbn in hits:
+                doc_id = self.catalog.doc_id(isbn)
+                if doc_id is not None:
+                    merged.append((key, doc_id, isbn))
+        best = heapq.nsmallest(k, merged) if k is not None else sorted(merged)
+        results = (self.catalog.get(isbn) for _, _, isbn in best)
+        return [item for item in results if item is not None]
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────────
+    def close(self):
+        if not self._conns:
+            return
+        self.catalog.detach(self._feed)
+        with self._lock:
+            for conn in self._conns:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+            for process in self._processes:
+                process.join(timeout=5)
+            self._conns, self._processes = [], []
+
+    def __enter__(self) -> "ShardedCatalog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ShardedCatalog({self.workers} workers, {len(self.catalog)} items)"
+
+
+def main():
+    from models.items import ItemStatus
+    from patterns.strategy.search_strategy import (
+        IndexedGenreSearchStrategy,
+        RankedSearchStrategy,
+        SearchContext,
+    )
+    from utils.dummy_data import get_dummy_items
+
+    catalog = CatalogStore(get_dummy_items())
+    with ShardedCatalog(catalog, workers=2) as shards:
+        print(shards, "shard sizes:", shards.sizes())
+        context = SearchContext(RankedSearchStrategy(k=3), shards=shards)
+        print("\nTop 3 for 'python learning':")
+        for item in context.search(catalog, "python learning"):
+            print(f"  {item.isbn} | {item.title}")
+
+        context.set_strategy(IndexedGenreSearchStrategy())
+        print("\nAvailable AI titles:")
+        for item in context.search(catalog, "AI", status="Available"):
+            print(f"  {item.isbn} | {item.title}")
+
+        catalog.get("9781617294433").update_status(ItemStatus.CHECKED_OUT)
+        print("\n...after one is checked out:")
+        for item in context.search(catalog, "AI", status="Available"):
+            print(f"  {item.isbn} | {item.title}")
+
+
+if __name__ == "__main__":
+    main()
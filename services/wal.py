@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+from typing import Iterable, Iterator, Optional
+
+
+class WriteAheadLog:
+    """
+    Append-only JSON-lines log of TransactionManager mutations.
+
+    Every record gets a monotonically increasing log sequence number (lsn).
+    Writes go through a buffered file; fsync is batched (group commit) and
+    happens once `sync_every` records are pending, or after `sync_interval`
+    seconds via a small background flusher, whichever comes first.
+    `sync_every=1` gives one fsync per record.
+    """
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: Optional[float] = 0.05):
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _drop_torn_tail(path)
+        self._next_lsn = self._last_lsn_on_disk() + 1
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._stop = threading.Event()
+        self._flusher = None
+        if sync_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    # ─── Writing ──────────────────────────────────────────────────────────────
+    def append(self, op: str, **fields) -> int:
+        """Append one record and return its lsn."""
+        return self.append_many([dict(fields, op=op)])
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Append records in order under one lock; returns the last lsn written."""
+        with self._lock:
+            lsn = self._next_lsn - 1
+            lines = []
+            for record in records:
+                lsn += 1
+                lines.append(json.dumps(dict(record, lsn=lsn), separators=(",", ":")))
+            if not lines:
+                return lsn
+            self._file.write("\n".join(lines) + "\n")
+            self._next_lsn = lsn + 1
+            self._pending += len(lines)
+            if self._pending >= self.sync_every:
+                self._sync_locked()
+            return lsn
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._closed or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.sync_interval):
+            if self._pending:
+                self.sync()
+
+    @property
+    def last_lsn(self) -> int:
+        return self._next_lsn - 1
+
+    def skip_to(self, lsn: int):
+        """Make sure new records are numbered after `lsn` (e.g. a snapshot's lsn)."""
+        with self._lock:
+            self._next_lsn = max(self._next_lsn, lsn + 1)
+
+    def truncate(self, upto_lsn: Optional[int] = None):
+        """
+        Drop records with lsn <= upto_lsn (all records by default) and keep
+        the tail. The file is rewritten and swapped in atomically; lsn
+        numbering carries on.
+        """
+        with self._lock:
+            self._file.flush()
+            if upto_lsn is None:
+                upto_lsn = self.last_lsn
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as tmp:
+                for record in read_records(self.path, upto_lsn):
+                    tmp.write(json.dumps(record, separators=(",", ":")) + "\n")
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._pending = 0
+
+    def close(self):
+        self._stop.set()
+        if self._flusher:
+            self._flusher.join()
+        with self._lock:
+            self._sync_locked()
+            self._closed = True
+            self._file.close()
+
+    # ─── Reading ──────────────────────────────────────────────────────────────
+    def replay(self, after_lsn: int = 0) -> Iterator[dict]:
+        """Yield records with lsn > after_lsn, stopping at a torn final line."""
+        return read_records(self.path, after_lsn)
+
+    def _last_lsn_on_disk(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            chunk = min(size, 64 * 1024)
+            f.seek(size - chunk)
+            tail = f.read(chunk).decode("utf-8", errors="ignore")
+        for line in reversed(tail.splitlines()):
+            try:
+                return json.loads(line)["lsn"]
+            except (ValueError, KeyError):
+                continue
+        return 0
+
+
+def _drop_torn_tail(path: str):
+    """Cut a partial last line (a crash mid-write) so new records start on a line of their own."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 64 * 1024)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+
+
+def read_records(path: str, after_lsn: int = 0) -> Iterator[dict]:
+    """
+    Records with lsn > after_lsn. A partial last line (a crash mid-write)
+    is skipped; an unreadable line anywhere else raises ValueError.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        bad_line = None
+        for line_no, line in enumerate(f, start=1):
+            if bad_line is not None:
+                raise ValueError(f"Corrupt write-ahead log record at {path}:{bad_line}")
+            try:
+                record = json.loads(line)
+            except ValueError:
+                bad_line = line_no
+                continue
+            if record["lsn"] > after_lsn:
+                yield record
@@ -0,0 +1,36 @@
+import json
+
+from models.bitmap_index import StatusBitmapIndex
+from models.catalog import CatalogStore
+from models.items import ItemStatus, PrintedBook
+from patterns.strategy.search_strategy import IndexedKeywordSearchStrategy, build_search_indexes
+from services.bulk_import import CatalogImporter, register_item_types
+
+
+def row(line, **fields):
+    base = {"type": "printedbook", "authors": "Frank Herbert", "isbn": "ISBN1", "genres": "Science Fiction",
+            "publication_year": 1965, "language": "English", "shelf_location": "B3"}
+    return line, json.dumps({**base, **fields})
+
+
+def test_upsert_updates_the_cataloged_item_in_place():
+    register_item_types()
+    held = PrintedBook("Dune", ["Frank Herbert"], "ISBN1", ["Science Fiction"], 1965, "English",
+                       ItemStatus.AVAILABLE, "A1")
+    catalog = CatalogStore([held])
+    build_search_indexes(catalog)
+    held.update_status(ItemStatus.CHECKED_OUT)
+
+    report = CatalogImporter(catalog, chunk_size=1).import_rows([
+        row(1, title="Dune Messiah", shelf_location="C9"),
+        row(2, type="ebook", title="Dune", file_format="EPUB"),
+    ])
+
+    assert (report.updated, report.rejected) == (1, 1)
+    assert catalog.get("ISBN1") is held
+    assert (held.title, held.shelf_location, held.status) == ("Dune Messiah", "C9", ItemStatus.CHECKED_OUT)
+    search = IndexedKeywordSearchStrategy()
+    assert search.search(catalog, "messiah") == [held]
+    # a later status change on the held reference still reaches the indexes
+    held.update_status(ItemStatus.AVAILABLE)
+    assert catalog.doc_id("ISBN1") in catalog.index(StatusBitmapIndex).bitmap("Available")
@@ -0,0 +1,27 @@
+from models.catalog import CatalogStore
+from patterns.strategy.search_strategy import (
+    FilterSearchStrategy,
+    IndexedGenreSearchStrategy,
+    IndexedKeywordSearchStrategy,
+    QuerySearchStrategy,
+    SearchContext,
+    build_search_indexes,
+)
+from services.facets import FacetEngine
+from utils.dummy_data import get_dummy_items
+
+
+def test_counts_from_result_bitmap_match_counts_from_items():
+    catalog = CatalogStore(get_dummy_items())
+    build_search_indexes(catalog)
+    engine = FacetEngine(catalog)
+    for strategy, query in [
+        (IndexedKeywordSearchStrategy(), "python"),
+        (IndexedGenreSearchStrategy(), "AI"),
+        (FilterSearchStrategy(), "AI AND English"),
+        (QuerySearchStrategy(), "year:>2000"),
+    ]:
+        context = SearchContext(strategy)
+        for filters in ({}, {"status": "Available"}):
+            items = context.search(catalog, query, **filters)
+            assert engine.counts(context.result_bitmap(catalog, query, **filters)) == engine.counts(items)
@@ -0,0 +1,19 @@
+from models.catalog import CatalogStore
+from models.items import ItemStatus, PrintedBook
+from patterns.strategy.search_strategy import IndexedGenreSearchStrategy, SearchContext
+
+
+def test_open_stream_survives_emptied_bitmap_chunk():
+    catalog = CatalogStore(
+        PrintedBook(f"Book {i}", ["Author"], f"ISBN{i}", ["Fantasy"], 2000, "English", ItemStatus.AVAILABLE, "A1")
+        for i in range(9000)
+    )
+    context = SearchContext(IndexedGenreSearchStrategy())
+    page = context.paginate(catalog, "Fantasy", 5000)
+    # empties the last 4096-id container of the genre bitmap
+    for i in range(8192, 9000):
+        catalog.remove(f"ISBN{i}")
+
+    page = context.fetch_page(page.next_cursor)
+    assert [item.isbn for item in page.items] == [f"ISBN{i}" for i in range(5000, 8192)]
+    assert not page.has_more
@@ -0,0 +1,29 @@
+import gc
+
+from models.registry import WeakRegistry
+
+
+class Obj:
+    def __init__(self, key):
+        self.key = key
+
+
+def test_collected_objects_leave_the_registry():
+    registry = WeakRegistry(lambda obj: obj.key)
+    kept = registry.register(Obj("a"))
+    registry.register(Obj("b"))
+    gc.collect()
+    assert registry.get("b") is None
+    assert list(registry) == [kept]
+
+
+def test_older_duplicate_resurfaces_when_newer_is_collected():
+    registry = WeakRegistry(lambda obj: obj.key)
+    old = registry.register(Obj("a"))
+    new = registry.register(Obj("a"))
+    assert registry.get("a") is new
+    del new
+    gc.collect()
+    assert registry.get("a") is old
+    registry.unregister(old)
+    assert "a" not in registry
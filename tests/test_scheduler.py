@@ -0,0 +1,48 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.scheduler import HierarchicalTimerWheel
+
+
+@pytest.mark.parametrize("slots,levels", [(4, 1), (8, 1), (4, 2), (8, 3)])
+def test_every_timer_fires_on_time(slots, levels):
+    rng = random.Random(slots * 10 + levels)
+    origin = datetime(2024, 1, 1)
+    wheel = HierarchicalTimerWheel(origin, slots=slots, levels=levels)
+    now = [0]
+    fired = {}
+    due = {}
+
+    def advance(tick):
+        now[0] = tick
+        wheel.advance(origin + timedelta(seconds=tick))
+
+    for i in range(300):
+        due[i] = now[0] + rng.randint(1, 200)
+        wheel.schedule(origin + timedelta(seconds=due[i]), lambda i=i: fired.setdefault(i, now[0]))
+        if rng.random() < 0.3:
+            advance(now[0] + rng.randint(0, 30))
+    for tick in range(now[0], now[0] + 201):
+        advance(tick)
+
+    assert set(fired) == set(due)
+    assert all(fired[i] >= due[i] for i in due)
+
+
+def test_no_due_reminder_for_a_loan_already_overdue():
+    from models.transactions import BorrowingTransaction
+    from patterns.singleton.transaction_manager import TransactionManager
+    from services.scheduler import LibraryScheduler, ManualClock
+
+    now = datetime(2024, 6, 1, 12)
+    tm = TransactionManager()
+    scheduler = LibraryScheduler(tm, clock=ManualClock(now))
+    try:
+        overdue = BorrowingTransaction("ana", "ISBN1", now - timedelta(days=20), 14)
+        due_soon = BorrowingTransaction("ana", "ISBN2", now, 3)
+        assert scheduler.schedule_due_reminder(overdue) is None
+        assert scheduler.schedule_due_reminder(due_soon) is not None
+    finally:
+        tm.scheduler = None
@@ -0,0 +1,68 @@
+from models.catalog import CatalogStore
+from models.search_index import CatalogIndex
+from models.items import ItemStatus
+from patterns.strategy.search_cache import SearchResultCache
+from patterns.strategy.search_strategy import IndexedKeywordSearchStrategy, SearchContext
+from utils.dummy_data import get_dummy_items
+
+
+def test_change_during_search_leaves_entry_stale():
+    catalog = CatalogStore(get_dummy_items())
+    context = SearchContext(IndexedKeywordSearchStrategy(), cache=SearchResultCache())
+    search = context._iter_search
+    item = next(iter(catalog))
+
+    def racing(items, query, filters):
+        results = list(search(items, query, filters))
+        item.update_status(ItemStatus.CHECKED_OUT)    # lands after the search ran
+        return iter(results)
+
+    context._iter_search = racing
+    context.search(catalog, "python")
+    context._iter_search = search
+
+    context.search(catalog, "python")
+    assert context.cache.hits == 0
+    assert context.cache.invalidations == 1
+
+
+class _SearchDuringUpdate(CatalogIndex):
+    """Runs a cached search from inside the catalog's index update, before the other indexes change."""
+
+    def __init__(self, run):
+        self.run = run
+
+    def add(self, doc_id, item):
+        pass
+
+    def status_changed(self, doc_id, item, old_status):
+        self.run()
+
+    def remove(self, doc_id, item):
+        self.run()
+
+
+def _racing_catalog():
+    catalog = CatalogStore(get_dummy_items())
+    context = SearchContext(IndexedKeywordSearchStrategy(), cache=SearchResultCache())
+    search = lambda: context.search(catalog, "python", status=ItemStatus.AVAILABLE)
+    catalog.attach(_SearchDuringUpdate(search))     # attached first, so it runs first
+    before = search()
+    assert before
+    return catalog, context, search, before[0]
+
+
+def test_search_racing_a_status_change_is_not_cached_as_current():
+    catalog, context, search, item = _racing_catalog()
+    item.update_status(ItemStatus.CHECKED_OUT)
+    hits = context.cache.hits
+    assert item not in search()
+    assert context.cache.hits == hits       # the mid-update results were not served
+
+
+def test_search_racing_a_removal_is_not_cached_as_current():
+    catalog, context, search, item = _racing_catalog()
+    catalog.remove(item.isbn)
+    hits = context.cache.hits
+    assert item not in search()
+    assert context.cache.hits == hits
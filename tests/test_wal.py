@@ -0,0 +1,44 @@
+import pytest
+
+from services.wal import WriteAheadLog
+
+
+def lsns(wal):
+    return [record["lsn"] for record in wal.replay()]
+
+
+def test_append_after_torn_last_line_is_replayed(tmp_path):
+    path = str(tmp_path / "tx.wal")
+    wal = WriteAheadLog(path, sync_every=1, sync_interval=None)
+    wal.append("borrow", user="a", isbn="1")
+    wal.append("borrow", user="b", isbn="2")
+    wal.close()
+    # crash mid-write: half a record, no trailing newline
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op":"borrow","us')
+
+    wal = WriteAheadLog(path, sync_every=1, sync_interval=None)
+    assert wal.append("borrow", user="c", isbn="3") == 3
+    wal.close()
+
+    wal = WriteAheadLog(path, sync_every=1, sync_interval=None)
+    assert lsns(wal) == [1, 2, 3]
+    assert [record["user"] for record in wal.replay()] == ["a", "b", "c"]
+    wal.close()
+
+
+def test_torn_last_line_is_skipped_on_replay(tmp_path):
+    path = tmp_path / "tx.wal"
+    path.write_text('{"op":"return","lsn":1}\n{"op":"ret', encoding="utf-8")
+    wal = WriteAheadLog(str(path), sync_every=1, sync_interval=None)
+    assert lsns(wal) == [1]
+    wal.close()
+
+
+def test_corrupt_record_before_the_end_raises(tmp_path):
+    path = tmp_path / "tx.wal"
+    path.write_text('{"op":"return","lsn":1}\nnot json\n{"op":"return","lsn":2}\n', encoding="utf-8")
+    wal = WriteAheadLog(str(path), sync_every=1, sync_interval=None)
+    with pytest.raises(ValueError):
+        list(wal.replay())
+    wal.close()
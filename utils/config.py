@@ -17,3 +17,18 @@ BORROW_DURATIONS = {
     Role.GUEST:      0,
     Role.LIBRARIAN: 60,
 }
+
+# Write-ahead log for TransactionManager state
+WAL_PATH = "data/transactions.wal"
+WAL_SYNC_EVERY = 64        # records per fsync (group commit)
+WAL_SYNC_INTERVAL = 0.05   # max seconds a record may wait for fsync
+
+# Snapshots of catalog/users/open loans; the WAL is truncated behind each one
+SNAPSHOT_DIR = "data/snapshots"
+SNAPSHOT_INTERVAL_MINUTES = 5
+
+# Results shown per page by search and catalog listings
+SEARCH_PAGE_SIZE = 10
+
+# Bulk catalog import: rows validated and applied to the catalog per chunk
+IMPORT_CHUNK_SIZE = 5000
@@ -0,0 +1,58 @@
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+class LockManager:
+    """
+    Per-user locks plus a fixed pool of ISBN lock stripes.
+
+    Locks are always taken in the same global order — user locks sorted by
+    name, then ISBN stripes sorted by stripe index — so any two operations,
+    including batches touching many users and items, can never deadlock.
+    All locks are re-entrant.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        self._user_locks: Dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()
+
+    def stripe_of(self, isbn: str) -> int:
+        return zlib.crc32(isbn.encode("utf-8")) % len(self._stripes)
+
+    def _user_lock(self, user_name: str) -> threading.RLock:
+        lock = self._user_locks.get(user_name)
+        if lock is None:
+            with self._guard:
+                lock = self._user_locks.setdefault(user_name, threading.RLock())
+        return lock
+
+    def _ordered(self, user_names: Iterable[str], isbns: Iterable[str]) -> List[threading.RLock]:
+        locks = [self._user_lock(name) for name in sorted(set(user_names))]
+        locks += [self._stripes[i] for i in sorted({self.stripe_of(isbn) for isbn in isbns})]
+        return locks
+
+    @contextmanager
+    def hold(self, user_names: Iterable[str] = (), isbns: Iterable[str] = ()):
+        """Hold the locks for the given users and items for the duration of the block."""
+        locks = self._ordered(user_names, isbns)
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @contextmanager
+    def hold_all_items(self):
+        """Hold every ISBN stripe; no item can change state inside the block."""
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()